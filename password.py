@@ -5,13 +5,43 @@ Features comprehensive password analysis using zxcvbn and secure generation
 """
 
 import sys
-import subprocess
 import importlib
+import importlib.util
 import os
+import string
+import math
+import time
+import hashlib
+import hmac
+import struct
+import threading
+import weakref
+import functools
+import mmap
+import csv
+import re
+import argparse
+import json
+import heapq
+import types
+import contextlib
+from collections import OrderedDict, deque
+from array import array
+from collections import Counter
+from collections.abc import Mapping
 
-def check_and_install_requirements():
-    """Check for required packages and install them if missing"""
-    # Check GTK3 availability
+# Importing this module has no side effects: GTK is loaded only when the GUI
+# starts, zxcvbn and NumPy on first use, and dependencies are installed only
+# when asked for with --install-deps
+
+Gtk = Pango = Gdk = GLib = None
+
+
+def load_gtk():
+    """Import GTK3 for the GUI, exiting with install instructions when it is missing"""
+    global Gtk, Pango, Gdk, GLib
+    if Gtk is not None:
+        return
     try:
         import gi
         gi.require_version('Gtk', '3.0')
@@ -24,15 +54,98 @@ def check_and_install_requirements():
         print("Fedora: sudo dnf install python3-gobject gtk3-devel")
         print("Arch: sudo pacman -S python-gobject gtk3")
         sys.exit(1)
+
+
+_zxcvbn = None
+_zxcvbn_dictionary_match = None
+# Snapshot of zxcvbn's ranked dictionaries, kept in cache_directory()
+ZXCVBN_SNAPSHOT_NAME = "zxcvbn-dictionaries.idx"
+
+
+def load_zxcvbn():
+    """Import zxcvbn on first use; only analysis needs it
+    
+    zxcvbn builds ~95,000 words into Python dicts on import. The first run
+    saves them as a memory-mapped RankedIndex; later processes find that
+    snapshot and import zxcvbn with an empty frequency list module instead.
     
+    This changes the zxcvbn module for the whole process: its
+    RANKED_DICTIONARIES may hold index-backed dictionaries, and
+    zxcvbn.matching.dictionary_match is replaced by _dictionary_match, which
+    answers those from the index and hands plain dicts to the original.
+    zxcvbn.zxcvbn() keeps giving the same results for other callers. The
+    empty frequency list module is only installed for the import itself.
+    """
+    global _zxcvbn, _zxcvbn_dictionary_match
+    if _zxcvbn is None:
+        snapshot = _open_zxcvbn_snapshot() if 'zxcvbn.matching' not in sys.modules else None
+        stub = None
+        if snapshot is not None and 'zxcvbn.frequency_lists' not in sys.modules:
+            stub = types.ModuleType('zxcvbn.frequency_lists')
+            stub.FREQUENCY_LISTS = {}
+            sys.modules['zxcvbn.frequency_lists'] = stub
+        try:
+            import zxcvbn
+            import zxcvbn.matching
+            import zxcvbn.scoring
+        except ImportError:
+            raise ImportError("zxcvbn is not installed; run 'python3 password.py --install-deps' "
+                              "or see the README") from None
+        finally:
+            # A later "import zxcvbn.frequency_lists" gets the real module
+            if stub is not None and sys.modules.get('zxcvbn.frequency_lists') is stub:
+                del sys.modules['zxcvbn.frequency_lists']
+                if getattr(sys.modules.get('zxcvbn'), 'frequency_lists', None) is stub:
+                    del sys.modules['zxcvbn'].frequency_lists
+        
+        # Matchers look dictionary_match up as a module global, so this
+        # replaces it for the reverse and l33t matchers as well
+        _zxcvbn_dictionary_match = zxcvbn.matching.dictionary_match
+        zxcvbn.matching.dictionary_match = _dictionary_match
+        if snapshot is not None:
+            # Updated in place: matcher default arguments hold this same dict
+            zxcvbn.matching.RANKED_DICTIONARIES.update(snapshot.dictionaries())
+        else:
+            _write_zxcvbn_snapshot(zxcvbn.matching.RANKED_DICTIONARIES)
+        _zxcvbn = zxcvbn
+    return _zxcvbn
+# NumPy is optional; it only speeds up class checks in large generated batches,
+# and is imported on first use because it dominates startup time
+# NumPy is optional; it only enables the vectorized generation backend, and
+# is imported on first use because it dominates startup time
+np = None
+_numpy_missing = False
+
+
+def load_numpy():
+    """Import NumPy on first use; returns None when it is not installed"""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np
+
+
+def numpy_available():
+    """Whether NumPy can be used, without importing it"""
+    return np is not None or (not _numpy_missing and importlib.util.find_spec('numpy') is not None)
+
+
+def check_and_install_requirements():
+    """Check for required packages and install them if missing"""
     # Check zxcvbn
     try:
-        import zxcvbn
-        print("All requirements satisfied!")
-        return
+        load_zxcvbn()
+        # Keep stdout clean for command line output
+        print("All requirements satisfied!", file=sys.stderr)
+        return 0
     except ImportError:
         pass
     
+    import subprocess
     print("zxcvbn not found. Attempting to install...")
     
     # Try different installation methods in order of preference
@@ -70,9 +183,10 @@ def check_and_install_requirements():
                 
                 # Test if installation worked
                 try:
-                    import zxcvbn
+                    importlib.invalidate_caches()
+                    load_zxcvbn()
                     print(f"zxcvbn installed successfully via {method['name']}!")
-                    return
+                    return 0
                 except ImportError:
                     continue
                     
@@ -84,6 +198,12 @@ def check_and_install_requirements():
     print("❌ INSTALLATION FAILED")
     print("="*60)
     print("SecretSauce requires the 'zxcvbn' package, but automatic installation failed.")
+    print_install_help()
+    return 1
+
+
+def print_install_help():
+    """Manual installation instructions for zxcvbn"""
     print("Please install it manually using ONE of these methods:")
     print()
     print("🔸 METHOD 1 - System Package Manager (Recommended):")
@@ -108,36 +228,24 @@ def check_and_install_requirements():
     print()
     print("After installation, run: python3 password.py")
     print("="*60)
-    sys.exit(1)
 
-# Check requirements before proceeding
-check_and_install_requirements()
 
-import gi
-gi.require_version('Gtk', '3.0')
-gi.require_version('Pango', '1.0')
-from gi.repository import Gtk, Pango, Gdk, GLib
-import secrets
-import string
-import math
-import time
-from pathlib import Path
-import webbrowser
-from zxcvbn import zxcvbn
 
-class AboutDialog(Gtk.Dialog):
+class AboutDialog:
     """About dialog for SecretSauce"""
     
     def __init__(self, parent):
-        super().__init__(title="About SecretSauce", parent=parent, modal=True)
-        self.set_default_size(500, 400)
-        self.set_resizable(False)
+        # Wraps a Gtk.Dialog rather than subclassing it, so this module can be
+        # imported without GTK
+        self.dialog = Gtk.Dialog(title="About SecretSauce", parent=parent, modal=True)
+        self.dialog.set_default_size(500, 400)
+        self.dialog.set_resizable(False)
         
         # Add close button
-        self.add_button("Close", Gtk.ResponseType.CLOSE)
+        self.dialog.add_button("Close", Gtk.ResponseType.CLOSE)
         
         # Main content area
-        content_area = self.get_content_area()
+        content_area = self.dialog.get_content_area()
         content_area.set_border_width(20)
         
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
@@ -159,7 +267,7 @@ class AboutDialog(Gtk.Dialog):
             "<span size='medium'>Advanced Password Generator &amp; Security Validator</span>\n\n"
             "Generate ultra-secure passwords with comprehensive security analysis.\n"
             "Powered by zxcvbn for professional-grade password strength evaluation\n"
-            "and cryptographically secure generation using Python's secrets module."
+            "and cryptographically secure generation from the operating system's CSPRNG."
         )
         desc_label.set_line_wrap(True)
         desc_label.set_justify(Gtk.Justification.CENTER)
@@ -203,7 +311,13 @@ class AboutDialog(Gtk.Dialog):
         license_label.set_margin_top(15)
         main_box.pack_start(license_label, False, False, 0)
         
-        self.show_all()
+        self.dialog.show_all()
+    
+    def run(self):
+        return self.dialog.run()
+    
+    def destroy(self):
+        self.dialog.destroy()
     
     def _add_grid_row(self, grid, row, label_text, value_text):
         label = Gtk.Label(label=label_text)
@@ -230,69 +344,1990 @@ class AboutDialog(Gtk.Dialog):
         return widget
     
     def _on_github_clicked(self, label, uri):
+        import webbrowser
         webbrowser.open(uri)
         return True
 
 
+class EntropySource:
+    """Base class for the random byte providers used by PasswordGenerator"""
+    
+    def read(self, n):
+        """Return n random bytes"""
+        raise NotImplementedError
+    
+    def randbelow(self, n):
+        """Return a uniformly distributed integer in [0, n)"""
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        if n <= 256:
+            # Common case (charset indices): a single byte per attempt
+            limit = 256 - (256 % n)
+            while True:
+                value = self.read(1)[0]
+                if value < limit:
+                    return value % n
+        nbytes = max(1, ((n - 1).bit_length() + 7) // 8)
+        span = 256 ** nbytes
+        limit = span - (span % n)
+        while True:
+            value = int.from_bytes(self.read(nbytes), 'big')
+            if value < limit:
+                return value % n
+    
+    def randbelow_many(self, n, count):
+        """Return count uniform integers in [0, n) as a list"""
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        width = max(1, ((n - 1).bit_length() + 7) // 8)
+        if width > 8:
+            return [self.randbelow(n) for _ in range(count)]
+        # Byte order does not matter for uniformity, so native integer views work
+        width = next(w for w in (1, 2, 4, 8) if w >= width)
+        span = 256 ** width
+        limit = span - (span % n)
+        
+        result = []
+        while len(result) < count:
+            needed = count - len(result)
+            raw = self.read((needed * span // limit + 8) * width)
+            if load_numpy() is not None:
+                values = np.frombuffer(raw, dtype=f'u{width}')
+                result.extend((values[values < limit] % n)[:needed].tolist())
+            else:
+                values = memoryview(raw).cast({1: 'B', 2: 'H', 4: 'I', 8: 'Q'}[width])
+                result.extend([v % n for v in values if v < limit][:needed])
+        return result
+    
+    def choice(self, seq):
+        """Return a uniformly chosen element of a non-empty sequence"""
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randbelow(len(seq))]
+
+
+# Buffered sources register here so fork() children discard inherited state
+_FORK_SENSITIVE_SOURCES = weakref.WeakSet()
+
+
+def _reset_entropy_after_fork():
+    for source in list(_FORK_SENSITIVE_SOURCES):
+        source._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_entropy_after_fork)
+
+
+class SystemEntropySource(EntropySource):
+    """Unbuffered OS CSPRNG, one os.urandom call per read"""
+    
+    def read(self, n):
+        return os.urandom(n)
+
+
+class BufferedOSEntropySource(EntropySource):
+    """OS CSPRNG read in large blocks and served from memory"""
+    
+    def __init__(self, block_size=65536):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._pos = 0
+        _FORK_SENSITIVE_SOURCES.add(self)
+    
+    def _after_fork(self):
+        # A forked child must never replay bytes the parent already holds
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._pos = 0
+    
+    def read(self, n):
+        if n > self.block_size:
+            return os.urandom(n)
+        
+        with self._lock:
+            end = self._pos + n
+            if end > len(self._buffer):
+                self._buffer = self._buffer[self._pos:] + os.urandom(self.block_size)
+                self._pos = 0
+                end = n
+            chunk = self._buffer[self._pos:end]
+            self._pos = end
+            return chunk
+
+
+CHACHA20_CONSTANTS = (0x61707865, 0x3320646e, 0x79622d32, 0x6b206574)
+
+
+CHACHA20_ROUNDS = ((0, 4, 8, 12), (1, 5, 9, 13), (2, 6, 10, 14), (3, 7, 11, 15),
+                   (0, 5, 10, 15), (1, 6, 11, 12), (2, 7, 8, 13), (3, 4, 9, 14))
+
+
+def _chacha20_keystream(key, nonce, counter, blocks):
+    """Return ChaCha20 (RFC 8439) keystream for the given number of 64-byte blocks"""
+    key_words = struct.unpack('<8I', key)
+    nonce_words = struct.unpack('<3I', nonce)
+    if load_numpy() is not None:
+        return _chacha20_keystream_numpy(key_words, nonce_words, counter, blocks)
+    return _chacha20_keystream_python(key_words, nonce_words, counter, blocks)
+
+
+def _chacha20_keystream_numpy(key_words, nonce_words, counter, blocks):
+    """Vectorized ChaCha20: every block runs through the rounds at once"""
+    state = np.empty((16, blocks), dtype=np.uint32)
+    state[0:4] = np.array(CHACHA20_CONSTANTS, dtype=np.uint32)[:, None]
+    state[4:12] = np.array(key_words, dtype=np.uint32)[:, None]
+    state[12] = np.arange(counter, counter + blocks, dtype=np.uint64).astype(np.uint32)
+    state[13:16] = np.array(nonce_words, dtype=np.uint32)[:, None]
+    x = state.copy()
+    
+    for _ in range(10):
+        for a, b, c, d in CHACHA20_ROUNDS:
+            x[a] += x[b]; x[d] ^= x[a]; x[d] = (x[d] << 16) | (x[d] >> 16)
+            x[c] += x[d]; x[b] ^= x[c]; x[b] = (x[b] << 12) | (x[b] >> 20)
+            x[a] += x[b]; x[d] ^= x[a]; x[d] = (x[d] << 8) | (x[d] >> 24)
+            x[c] += x[d]; x[b] ^= x[c]; x[b] = (x[b] << 7) | (x[b] >> 25)
+    
+    x += state
+    return x.T.astype('<u4').tobytes()
+
+
+def _chacha20_keystream_python(key_words, nonce_words, counter, blocks):
+    """Pure-Python ChaCha20 block function, used when NumPy is unavailable"""
+    mask = 0xffffffff
+    output = bytearray()
+    for block in range(blocks):
+        state = list(CHACHA20_CONSTANTS + key_words) + [(counter + block) & mask] + list(nonce_words)
+        w = state[:]
+        for _ in range(10):
+            for a, b, c, d in CHACHA20_ROUNDS:
+                w[a] = (w[a] + w[b]) & mask; w[d] ^= w[a]; w[d] = ((w[d] << 16) | (w[d] >> 16)) & mask
+                w[c] = (w[c] + w[d]) & mask; w[b] ^= w[c]; w[b] = ((w[b] << 12) | (w[b] >> 20)) & mask
+                w[a] = (w[a] + w[b]) & mask; w[d] ^= w[a]; w[d] = ((w[d] << 8) | (w[d] >> 24)) & mask
+                w[c] = (w[c] + w[d]) & mask; w[b] ^= w[c]; w[b] = ((w[b] << 7) | (w[b] >> 25)) & mask
+        output += struct.pack('<16I', *((w[i] + state[i]) & mask for i in range(16)))
+    return bytes(output)
+
+
+class ChaCha20EntropySource(EntropySource):
+    """ChaCha20 DRBG with fast key erasure, periodically reseeded from the OS"""
+    
+    def __init__(self, block_size=65536, reseed_interval=1 << 30):
+        self.block_size = block_size
+        self.reseed_interval = reseed_interval
+        self._lock = threading.Lock()
+        self._key = os.urandom(32)
+        self._buffer = b""
+        self._pos = 0
+        self._since_reseed = 0
+        if reseed_interval is not None:
+            _FORK_SENSITIVE_SOURCES.add(self)
+    
+    def _after_fork(self):
+        # Force a reseed so parent and child streams diverge
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._pos = 0
+        self._since_reseed = self.reseed_interval
+    
+    def _refill(self):
+        """Produce a new block and immediately replace the key with its first 32 bytes"""
+        if self.reseed_interval is not None and self._since_reseed >= self.reseed_interval:
+            self._key = hashlib.sha256(self._key + os.urandom(32)).digest()
+            self._since_reseed = 0
+        
+        blocks = (32 + self.block_size + 63) // 64
+        stream = _chacha20_keystream(self._key, bytes(12), 0, blocks)
+        self._key = stream[:32]
+        self._buffer = stream[32:]
+        self._pos = 0
+        self._since_reseed += len(self._buffer)
+    
+    def read(self, n):
+        with self._lock:
+            end = self._pos + n
+            if end <= len(self._buffer):
+                chunk = self._buffer[self._pos:end]
+                self._pos = end
+                return chunk
+            
+            chunks = []
+            while n > 0:
+                if self._pos >= len(self._buffer):
+                    self._refill()
+                chunk = self._buffer[self._pos:self._pos + n]
+                self._pos += len(chunk)
+                n -= len(chunk)
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+
+class SeededEntropySource(ChaCha20EntropySource):
+    """Deterministic ChaCha20 stream for benchmarks and reproducible tests only"""
+    
+    def __init__(self, seed, block_size=65536):
+        super().__init__(block_size=block_size, reseed_interval=None)
+        if isinstance(seed, int):
+            seed = str(seed)
+        if isinstance(seed, str):
+            seed = seed.encode('utf-8')
+        self._key = hashlib.sha256(b"SecretSauce seeded entropy:" + seed).digest()
+
+
+ENTROPY_SOURCES = {
+    'os': SystemEntropySource,
+    'buffered': BufferedOSEntropySource,
+    'chacha20': ChaCha20EntropySource,
+}
+
+
+def create_entropy_source(kind='buffered', seed=None):
+    """Create an entropy source by name; a seed always selects the seeded mode"""
+    if seed is not None or kind == 'seeded':
+        if seed is None:
+            raise ValueError("The seeded entropy source requires a seed")
+        return SeededEntropySource(seed)
+    try:
+        return ENTROPY_SOURCES[kind]()
+    except KeyError:
+        raise ValueError(f"Unknown entropy source: {kind}") from None
+
+
+class GenerationInfo:
+    """How a password was generated: enough to compute its search space exactly"""
+    
+    __slots__ = ('length', 'log10_space', 'source')
+    
+    def __init__(self, length, log10_space, source):
+        self.length = length            # None when the length varies (passphrases)
+        self.log10_space = log10_space  # log10 of the number of possible outputs
+        self.source = source            # short human-readable description
+    
+    def __repr__(self):
+        return f"GenerationInfo(length={self.length}, log10_space={self.log10_space:.2f}, source={self.source!r})"
+
+
+def _log10_int(value):
+    """log10 of a (possibly huge) positive integer without float overflow"""
+    shift = max(0, value.bit_length() - 53)
+    return math.log10(value >> shift) + shift * math.log10(2)
+
+
+@functools.lru_cache(maxsize=256)
+def covered_search_space_log10(class_sizes, length):
+    """log10 of the number of strings that contain every class at least once
+    
+    Inclusion-exclusion over the classes that are missing:
+    sum over subsets S of (-1)^|S| * (total - size(S)) ** length.
+    Passwords shorter than the number of classes cannot hold them all; the
+    class fix-up then gives every character a different class, so those
+    are counted instead: length! times the sum, over every choice of
+    `length` classes, of the product of their sizes.
+    """
+    if length < len(class_sizes):
+        # choices[j]: sum of the products of the sizes of every j-class subset
+        choices = [1] + [0] * length
+        for size in class_sizes:
+            for j in range(length, 0, -1):
+                choices[j] += choices[j - 1] * size
+        return _log10_int(math.factorial(length) * choices[length])
+    
+    total = sum(class_sizes)
+    count = 0
+    for mask in range(1 << len(class_sizes)):
+        excluded = sum(size for k, size in enumerate(class_sizes) if mask >> k & 1)
+        sign = -1 if bin(mask).count('1') % 2 else 1
+        count += sign * (total - excluded) ** length
+    return _log10_int(count) if count > 0 else float('-inf')
+
+
+class PasswordBatch:
+    """Compact batch of passwords stored in one contiguous buffer plus offsets"""
+    
+    __slots__ = ('_buffer', '_offsets')
+    
+    def __init__(self, buffer, offsets):
+        self._buffer = buffer    # bytearray holding every password back to back
+        self._offsets = offsets  # array('Q') with len(batch) + 1 boundaries
+    
+    def __len__(self):
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                # Share the buffer, only the (small) offset table is copied
+                return PasswordBatch(self._buffer, self._offsets[start:max(start, stop) + 1])
+            return PasswordBatch.from_passwords(self[i] for i in range(start, stop, step))
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PasswordBatch index out of range")
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+    
+    def __iter__(self):
+        buffer, offsets = self._buffer, self._offsets
+        for i in range(len(offsets) - 1):
+            yield buffer[offsets[i]:offsets[i + 1]].decode('utf-8')
+    
+    def get_bytes(self, index):
+        """Return a zero-copy view of a single password"""
+        view = memoryview(self._buffer)
+        return view[self._offsets[index]:self._offsets[index + 1]]
+    
+    def uniform_length(self):
+        """Byte length shared by every password, or None when lengths differ"""
+        offsets = self._offsets
+        if len(offsets) < 2:
+            return None
+        length = offsets[1] - offsets[0]
+        if offsets[-1] - offsets[0] != length * (len(offsets) - 1):
+            return None
+        if not length:
+            return 0  # offsets never decrease, so every password is empty
+        # Every boundary, not just the ends: mixed lengths can add up to the same total
+        return length if offsets == array('Q', range(offsets[0], offsets[-1] + 1, length)) else None
+    
+    @property
+    def buffer(self):
+        """Zero-copy view of the raw bytes covered by this batch"""
+        return memoryview(self._buffer)[self._offsets[0]:self._offsets[-1]]
+    
+    def wipe(self):
+        """Overwrite the underlying buffer with zeros"""
+        self._buffer[self._offsets[0]:self._offsets[-1]] = bytes(self._offsets[-1] - self._offsets[0])
+    
+    @classmethod
+    def from_passwords(cls, passwords):
+        """Build a batch from an iterable of passwords"""
+        buffer = bytearray()
+        offsets = array('Q', [0])
+        for password in passwords:
+            buffer += password.encode('utf-8')
+            offsets.append(len(buffer))
+        return cls(buffer, offsets)
+
+
+class PasswordPolicy:
+    """Generation constraints: per-class minimums, exclusions, run limits, symbol set"""
+    
+    # Characters that are easily confused with one another when read or typed
+    AMBIGUOUS_CHARACTERS = "0OoIl1|`'\""
+    
+    def __init__(self, use_lower=True, use_upper=True, use_digits=True, use_symbols=True,
+                 min_lower=1, min_upper=1, min_digits=1, min_symbols=1,
+                 symbols=None, exclude="", exclude_ambiguous=False, max_run=None):
+        self.use_lower = use_lower
+        self.use_upper = use_upper
+        self.use_digits = use_digits
+        self.use_symbols = use_symbols
+        # Minimums only apply to enabled classes
+        self.min_lower = min_lower if use_lower else 0
+        self.min_upper = min_upper if use_upper else 0
+        self.min_digits = min_digits if use_digits else 0
+        self.min_symbols = min_symbols if use_symbols else 0
+        self.symbols = symbols
+        self.exclude = "".join(sorted(set(exclude)))
+        self.exclude_ambiguous = exclude_ambiguous
+        if max_run is not None and max_run < 1:
+            raise ValueError("max_run must be at least 1")
+        self.max_run = max_run
+    
+    def _key(self):
+        return (self.use_lower, self.use_upper, self.use_digits, self.use_symbols,
+                self.min_lower, self.min_upper, self.min_digits, self.min_symbols,
+                self.symbols, self.exclude, self.exclude_ambiguous, self.max_run)
+    
+    def __eq__(self, other):
+        return isinstance(other, PasswordPolicy) and self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+
+
+class PolicySampler:
+    """Compiled policy that samples uniformly from all compliant passwords in one pass
+    
+    A counting table N[r][deficits][run state] holds, up to a per-level scale,
+    the number of ways to finish a password with r characters left. Each
+    position is then drawn with probability proportional to the completions
+    it leaves, so every compliant password is equally likely and no draw is
+    ever rejected or patched afterwards.
+    """
+    
+    def __init__(self, classes, minimums, length, max_run=None):
+        self.classes = [c.encode('ascii') for c in classes]
+        self.length = length
+        self.max_run = max_run
+        
+        # Deficits (characters still required per class) as a mixed-radix index
+        self._radix = [m + 1 for m in minimums]
+        self._strides = []
+        stride = 1
+        for radix in self._radix:
+            self._strides.append(stride)
+            stride *= radix
+        self._deficit_states = stride
+        self._start_deficit = sum(m * st for m, st in zip(minimums, self._strides))
+        self._decrement = [
+            [d - st if (d // st) % radix else d for d in range(stride)]
+            for st, radix in zip(self._strides, self._radix)
+        ]
+        
+        # Run states: 0 is "nothing emitted yet", then (class, run length) pairs
+        run = max_run or 1
+        self._run_states = 1 + len(self.classes) * run if max_run else 1
+        self._options = [self._run_options(s) for s in range(self._run_states)]
+        
+        self._build_table()
+    
+    def _run_state(self, k, t):
+        return 1 + k * self.max_run + (t - 1) if self.max_run else 0
+    
+    def _run_options(self, state):
+        """List (class, ways, next run state, repeats previous char) for a run state"""
+        options = []
+        if not self.max_run or state == 0:
+            for j, chars in enumerate(self.classes):
+                options.append((j, len(chars), self._run_state(j, 1), False))
+            return options
+        
+        last_class, run = divmod(state - 1, self.max_run)
+        run += 1
+        for j, chars in enumerate(self.classes):
+            ways = len(chars) - (1 if j == last_class else 0)
+            if ways:
+                options.append((j, ways, self._run_state(j, 1), False))
+        if run < self.max_run:
+            options.append((last_class, 1, self._run_state(last_class, run + 1), True))
+        return options
+    
+    def _build_table(self):
+        """Fill the scaled completion counts bottom-up, one level per remaining length"""
+        S = self._run_states
+        size = self._deficit_states * S
+        level = array('d', [0.0]) * size
+        for s in range(S):
+            level[s] = 1.0  # deficit index 0: every minimum already met
+        self._levels = [level]
+        log10_scale = 0.0
+        
+        for _ in range(self.length):
+            previous = level
+            level = array('d', [0.0]) * size
+            for d in range(self._deficit_states):
+                for s in range(S):
+                    total = 0.0
+                    for j, ways, next_state, _repeat in self._options[s]:
+                        total += ways * previous[self._decrement[j][d] * S + next_state]
+                    level[d * S + s] = total
+            # Rescale so long passwords never overflow; sampling only needs ratios
+            peak = max(level)
+            if peak > 0:
+                for i in range(size):
+                    level[i] /= peak
+                log10_scale += math.log10(peak)
+            self._levels.append(level)
+        
+        start = self._levels[self.length][self._start_deficit * S]
+        if start <= 0:
+            raise ValueError("No password of this length satisfies the policy")
+        # Exact size of the compliant search space (to float precision)
+        self.log10_space = log10_scale + math.log10(start)
+    
+    def sample(self, entropy, out=None, offset=0):
+        """Draw one compliant password, optionally writing into out[offset:]"""
+        S = self._run_states
+        if out is None:
+            out = bytearray(self.length)
+            offset = 0
+        
+        deficit = self._start_deficit
+        state = 0
+        last = None
+        for pos in range(self.length):
+            following = self._levels[self.length - pos - 1]
+            options = self._options[state]
+            weights = [ways * following[self._decrement[j][deficit] * S + next_state]
+                       for j, ways, next_state, _repeat in options]
+            
+            # 53-bit uniform float in [0, total)
+            target = (int.from_bytes(entropy.read(7), 'big') >> 3) / 9007199254740992.0 * sum(weights)
+            choice = len(options) - 1
+            for i, weight in enumerate(weights):
+                if target < weight:
+                    choice = i
+                    break
+                target -= weight
+            while weights[choice] == 0:  # float edge: never land on a dead option
+                choice -= 1
+            
+            j, ways, state, repeat = options[choice]
+            chars = self.classes[j]
+            if repeat:
+                char = last
+            elif last is not None and self.max_run and last in chars:
+                # Any character of class j except the previous one
+                index = entropy.randbelow(len(chars) - 1)
+                char = chars[index]
+                if char == last:
+                    char = chars[-1]
+            else:
+                char = chars[entropy.randbelow(len(chars))]
+            
+            out[offset + pos] = char
+            deficit = self._decrement[j][deficit]
+            last = char
+        
+        return out
+
+
+class CompiledTemplate:
+    """Parsed pattern template: one charset per position, shared between generations"""
+    
+    __slots__ = ('template', 'charsets', 'positions', 'length', 'log10_space')
+    
+    def __init__(self, template, position_charsets):
+        self.template = template
+        self.charsets = list(dict.fromkeys(position_charsets))
+        lookup = {charset: k for k, charset in enumerate(self.charsets)}
+        self.positions = [lookup[charset] for charset in position_charsets]
+        self.length = len(position_charsets)
+        # Exact search space: positions are drawn independently
+        self.log10_space = sum(math.log10(len(self.charsets[k])) for k in self.positions)
+    
+    @property
+    def entropy_bits(self):
+        return self.log10_space / math.log10(2)
+
+
+TEMPLATE_VOWELS = "aeiou"
+TEMPLATE_CONSONANTS = "bcdfghjklmnpqrstvwxyz"
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(template, symbols="!@#$%^&*()_+-=[]{}|;:,.<>?"):
+    """Compile a pattern template into a CompiledTemplate (cached per template)
+    
+    Placeholders: l lowercase, u uppercase, d digit, S symbol, a letter,
+    A letter or digit, x any character, c/C consonant, v/V vowel, h/H hex
+    digit. [abc0-9] is a custom set, \\ escapes the next character, (...)
+    groups, and {n} repeats the preceding element n times. Anything else is
+    copied literally, e.g. "Cvcc-dddd-SSSS" or "(x{8}-){3}x{8}".
+    """
+    classes = {
+        'l': string.ascii_lowercase,
+        'u': string.ascii_uppercase,
+        'd': string.digits,
+        'S': symbols,
+        'a': string.ascii_letters,
+        'A': string.ascii_letters + string.digits,
+        'x': string.ascii_letters + string.digits + symbols,
+        'c': TEMPLATE_CONSONANTS,
+        'C': TEMPLATE_CONSONANTS.upper(),
+        'v': TEMPLATE_VOWELS,
+        'V': TEMPLATE_VOWELS.upper(),
+        'h': string.digits + "abcdef",
+        'H': string.digits + "ABCDEF",
+    }
+    
+    def expand_set(spec):
+        chars = []
+        i = 0
+        while i < len(spec):
+            if i + 2 < len(spec) and spec[i + 1] == '-':
+                if spec[i] > spec[i + 2]:
+                    raise ValueError(f"Invalid range in template set: {spec[i:i + 3]}")
+                chars.extend(chr(c) for c in range(ord(spec[i]), ord(spec[i + 2]) + 1))
+                i += 3
+            else:
+                chars.append(spec[i])
+                i += 1
+        if not chars:
+            raise ValueError("Empty character set in template")
+        return "".join(dict.fromkeys(chars))
+    
+    def parse(i, depth):
+        positions = []
+        while i < len(template):
+            char = template[i]
+            if char == ')':
+                if not depth:
+                    raise ValueError("Unbalanced ')' in template")
+                return positions, i + 1
+            if char == '{':
+                raise ValueError("Repeat count without a preceding element in template")
+            if char == '(':
+                item, i = parse(i + 1, depth + 1)
+            elif char == '[':
+                end = template.find(']', i + 1)
+                if end < 0:
+                    raise ValueError("Unterminated '[' in template")
+                item = [expand_set(template[i + 1:end])]
+                i = end + 1
+            elif char == '\\':
+                if i + 1 >= len(template):
+                    raise ValueError("Dangling escape at end of template")
+                item = [template[i + 1]]
+                i += 2
+            else:
+                item = [classes.get(char, char)]
+                i += 1
+            
+            if i < len(template) and template[i] == '{':
+                end = template.find('}', i)
+                if end < 0 or not template[i + 1:end].isdigit():
+                    raise ValueError("Repeat count must look like {n}")
+                item = item * int(template[i + 1:end])
+                i = end + 1
+            positions.extend(item)
+        if depth:
+            raise ValueError("Unclosed '(' in template")
+        return positions, i
+    
+    positions, _ = parse(0, 0)
+    if not positions:
+        raise ValueError("Template produces an empty password")
+    for charset in set(positions):
+        if any(ord(c) > 126 for c in charset) or not charset.isprintable():
+            raise ValueError("Templates may only produce printable ASCII characters")
+    return CompiledTemplate(template, [charset.encode('ascii') for charset in positions])
+
+
 class PasswordGenerator:
     """Cryptographically secure password generator"""
     
-    def __init__(self):
+    # NumPy only vectorizes the class-coverage check, which wins once a batch
+    # has about 32 passwords (measured at 8-4096 characters); smaller batches,
+    # single passwords included, are faster on the pure-Python path.
+    # Filling the buffer always uses bytes.translate(), which beat a NumPy
+    # rejection mask at every size measured (up to 3 MB)
+    NUMPY_MIN_ROWS = 32
+    
+    def __init__(self, backend=None, entropy=None):
         self.lowercase = string.ascii_lowercase
         self.uppercase = string.ascii_uppercase
         self.digits = string.digits
         self.symbols = "!@#$%^&*()_+-=[]{}|;:,.<>?"
         
-    def generate(self, length=64, use_lower=True, use_upper=True, use_digits=True, use_symbols=True):
-        """Generate cryptographically secure password"""
-        charset = ""
+        # 'numpy' vectorizes class checks in large batches, 'python' needs no extras
+        if backend is None:
+            backend = 'numpy' if numpy_available() else 'python'
+        if backend not in ('numpy', 'python'):
+            raise ValueError(f"Unknown generator backend: {backend}")
+        if backend == 'numpy' and not numpy_available():
+            raise ValueError("The numpy backend requires NumPy to be installed")
+        self.backend = backend
+        self.entropy = entropy if entropy is not None else BufferedOSEntropySource()
+        self._samplers = OrderedDict()
+    
+    def _selected_classes(self, use_lower, use_upper, use_digits, use_symbols):
+        """Return the character classes selected by the given options"""
+        classes = []
         if use_lower:
-            charset += self.lowercase
+            classes.append(self.lowercase)
         if use_upper:
-            charset += self.uppercase
+            classes.append(self.uppercase)
         if use_digits:
-            charset += self.digits
+            classes.append(self.digits)
         if use_symbols:
-            charset += self.symbols
+            classes.append(self.symbols)
+        return classes
         
-        if not charset:
-            return "Error: No character sets selected"
+    def generate(self, length=64, use_lower=True, use_upper=True, use_digits=True, use_symbols=True):
+        """Generate cryptographically secure password
         
-        # Use secrets for cryptographically secure generation
-        password = ''.join(secrets.choice(charset) for _ in range(length))
-        
-        # Ensure all selected character classes are represented
-        classes_needed = []
-        if use_lower and not any(c in self.lowercase for c in password):
-            classes_needed.append(self.lowercase)
-        if use_upper and not any(c in self.uppercase for c in password):
-            classes_needed.append(self.uppercase)
-        if use_digits and not any(c in self.digits for c in password):
-            classes_needed.append(self.digits)
-        if use_symbols and not any(c in self.symbols for c in password):
-            classes_needed.append(self.symbols)
-        
-        # If any classes are missing, replace random characters
-        if classes_needed:
-            password_list = list(password)
-            for char_class in classes_needed:
-                if len(password_list) > 0:
-                    # Replace a random position with a character from the missing class
-                    pos = secrets.randbelow(len(password_list))
-                    password_list[pos] = secrets.choice(char_class)
-            password = ''.join(password_list)
+        Shares generate_batch()'s fill and class-coverage fix-up, so single
+        passwords follow the same distribution that generation_info() describes.
+        """
+        if not self._selected_classes(use_lower, use_upper, use_digits, use_symbols):
+            return "Error: No character sets selected"
         
+        batch = self.generate_batch(1, length, use_lower, use_upper, use_digits, use_symbols)
+        password = batch[0]
+        batch.wipe()
         return password
+    
+    def _class_presence(self, chars, classes):
+        """Return a boolean array (per class, per row) of class occurrence in chars"""
+        lookup = np.zeros((len(classes), 256), dtype=bool)
+        for k, char_class in enumerate(classes):
+            lookup[k, np.frombuffer(char_class, dtype=np.uint8)] = True
+        return np.array([lookup[k][chars].any(axis=-1) for k in range(len(classes))])
+    
+    def generate_batch(self, n, length=64, use_lower=True, use_upper=True, use_digits=True, use_symbols=True):
+        """Generate n passwords from one shared random buffer"""
+        classes = [c.encode('ascii') for c in
+                   self._selected_classes(use_lower, use_upper, use_digits, use_symbols)]
+        charset = b"".join(classes)
+        
+        if not charset:
+            raise ValueError("No character sets selected")
+        if n < 0 or length < 0:
+            raise ValueError("Batch size and length must not be negative")
+        
+        buffer = bytearray(n * length)
+        self._fill_from_charset(buffer, charset)
+        offsets = array('Q', range(0, n * length + 1, length)) if length else array('Q', [0] * (n + 1))
+        
+        # Ensure all selected character classes are represented in every password
+        if self.backend == 'numpy' and length and n >= self.NUMPY_MIN_ROWS:
+            load_numpy()
+            rows = np.frombuffer(buffer, dtype=np.uint8).reshape(n, length)
+            incomplete = ~self._class_presence(rows, classes).all(axis=0)
+            for row in np.flatnonzero(incomplete).tolist():
+                self._cover_classes(buffer, row * length, (row + 1) * length, classes)
+        elif length:
+            for start in range(0, n * length, length):
+                self._cover_classes(buffer, start, start + length, classes)
+        
+        return PasswordBatch(buffer, offsets)
+    
+    def generation_info(self, length=64, use_lower=True, use_upper=True, use_digits=True, use_symbols=True):
+        """GenerationInfo for generate()/generate_batch() with these options"""
+        sizes = tuple(len(c) for c in self._selected_classes(use_lower, use_upper, use_digits, use_symbols))
+        if not sizes:
+            raise ValueError("No character sets selected")
+        return GenerationInfo(length, covered_search_space_log10(sizes, length),
+                              f"{sum(sizes)}-character set, every selected class present")
+    
+    def policy_info(self, policy, length=64):
+        """GenerationInfo for generate_with_policy()"""
+        return GenerationInfo(length, self.compile_policy(policy, length).log10_space, "policy-compliant")
+    
+    def template_info(self, template):
+        """GenerationInfo for generate_from_template()"""
+        if not isinstance(template, CompiledTemplate):
+            template = compile_template(template, self.symbols)
+        return GenerationInfo(template.length, template.log10_space, f"template {template.template!r}")
+    
+    def compile_policy(self, policy, length):
+        """Return the (cached) PolicySampler for a policy and length"""
+        key = (policy, length)
+        sampler = self._samplers.get(key)
+        if sampler is not None:
+            self._samplers.move_to_end(key)
+            return sampler
+        
+        excluded = set(policy.exclude)
+        if policy.exclude_ambiguous:
+            excluded.update(PasswordPolicy.AMBIGUOUS_CHARACTERS)
+        symbols = policy.symbols if policy.symbols is not None else self.symbols
+        
+        classes = []
+        minimums = []
+        seen = set()
+        for enabled, chars, minimum in ((policy.use_lower, self.lowercase, policy.min_lower),
+                                        (policy.use_upper, self.uppercase, policy.min_upper),
+                                        (policy.use_digits, self.digits, policy.min_digits),
+                                        (policy.use_symbols, symbols, policy.min_symbols)):
+            if not enabled:
+                continue
+            chars = "".join(dict.fromkeys(c for c in chars if c not in excluded))
+            if any(ord(c) > 126 for c in chars) or not chars.isprintable():
+                raise ValueError("Character classes must be printable ASCII")
+            if seen.intersection(chars):
+                raise ValueError("Character classes must not overlap")
+            seen.update(chars)
+            if not chars:
+                if minimum:
+                    raise ValueError("A required character class is empty after exclusions")
+                continue
+            classes.append(chars)
+            minimums.append(minimum)
+        
+        if not classes:
+            raise ValueError("No character sets selected")
+        
+        sampler = PolicySampler(classes, minimums, length, policy.max_run)
+        self._samplers[key] = sampler
+        if len(self._samplers) > 16:
+            self._samplers.popitem(last=False)
+        return sampler
+    
+    def generate_with_policy(self, policy, length=64):
+        """Generate one password drawn uniformly from all policy-compliant passwords"""
+        sampler = self.compile_policy(policy, length)
+        return sampler.sample(self.entropy).decode('ascii')
+    
+    def generate_batch_with_policy(self, policy, n, length=64):
+        """Generate n policy-compliant passwords into a PasswordBatch"""
+        sampler = self.compile_policy(policy, length)
+        buffer = bytearray(n * length)
+        for start in range(0, n * length, length or 1):
+            sampler.sample(self.entropy, buffer, start)
+        offsets = array('Q', range(0, n * length + 1, length)) if length else array('Q', [0] * (n + 1))
+        return PasswordBatch(buffer, offsets)
+    
+    def generate_from_template(self, template):
+        """Generate one password from a pattern template (see compile_template)"""
+        return self.generate_batch_from_template(template, 1)[0]
+    
+    def generate_batch_from_template(self, template, n):
+        """Generate n passwords from a template, drawing one column at a time"""
+        if not isinstance(template, CompiledTemplate):
+            template = compile_template(template, self.symbols)
+        length = template.length
+        buffer = bytearray(n * length)
+        
+        if n and length:
+            # Draw all positions that share a charset in one go, then scatter
+            # each position's n characters into place with one strided copy
+            columns = {}
+            for pos, k in enumerate(template.positions):
+                columns.setdefault(k, []).append(pos)
+            for k, cols in columns.items():
+                charset = template.charsets[k]
+                if len(charset) == 1:
+                    drawn = charset * (n * len(cols))
+                else:
+                    indices = self.entropy.randbelow_many(len(charset), n * len(cols))
+                    drawn = bytes(indices).translate(charset.ljust(256, b"\0"))
+                for j, pos in enumerate(cols):
+                    buffer[pos::length] = drawn[j * n:(j + 1) * n]
+        
+        offsets = array('Q', range(0, n * length + 1, length)) if length else array('Q', [0] * (n + 1))
+        return PasswordBatch(buffer, offsets)
+    
+    def _fill_from_charset(self, out, charset):
+        """Fill a bytearray with uniformly drawn characters from charset"""
+        size = len(charset)
+        # Bytes at or above limit would make "byte % size" biased, so reject them
+        limit = 256 - (256 % size)
+        table = bytes(charset[b % size] for b in range(limit)) + bytes(256 - limit)
+        rejected = bytes(range(limit, 256))
+        
+        filled = 0
+        total = len(out)
+        while filled < total:
+            needed = total - filled
+            # Over-draw slightly so a single read is usually enough
+            block = self.entropy.read(needed * 256 // limit + 16)
+            accepted = block.translate(table, rejected)[:needed]
+            out[filled:filled + len(accepted)] = accepted
+            filled += len(accepted)
+    
+    def _cover_classes(self, buffer, start, end, classes):
+        """Replace random positions so every class occurs in buffer[start:end]"""
+        password = bytes(buffer[start:end])
+        missing = [c for c in classes if len(password.translate(None, c)) == len(password)]
+        if not missing:
+            return
+        
+        class_of = {b: k for k, char_class in enumerate(classes) for b in char_class}
+        for char_class in missing:
+            # Only overwrite characters whose class still occurs elsewhere,
+            # so fixing one class never removes the last member of another
+            counts = [len(password) - len(password.translate(None, c)) for c in classes]
+            candidates = [i for i, b in enumerate(password) if counts[class_of[b]] > 1]
+            if not candidates:
+                break
+            pos = candidates[self.entropy.randbelow(len(candidates))]
+            buffer[start + pos] = self.entropy.choice(char_class)
+            password = bytes(buffer[start:end])
+
+
+@contextlib.contextmanager
+def _replace_file(path):
+    """Write to a uniquely named temporary file beside path, then rename it over path
+    
+    Processes that have the old file memory-mapped keep reading it, and
+    concurrent builders never write into each other's files.
+    """
+    import tempfile
+    path = str(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class Wordlist:
+    """Memory-mapped wordlist with a prebuilt offset index for O(1) word lookup
+    
+    The index lives next to the wordlist (``<path>.idx``), or in the cache
+    directory when the wordlist's directory is read-only, and is rebuilt
+    automatically when the wordlist's size or modification time changes.
+    Opening a wordlist maps both files; no word is read until it is used.
+    """
+    
+    INDEX_MAGIC = b"SSWLIDX1"
+    INDEX_HEADER = struct.Struct('<8sQQQ')   # magic, source size, source mtime_ns, word count
+    INDEX_RECORD = struct.Struct('<QI')      # word start offset, word length in bytes
+    # Diceware lists prefix every word with its dice roll, e.g. "11111<TAB>abacus"
+    DICEWARE_LINE = re.compile(rb'^[1-6]+\s+(\S.*)$')
+    
+    def __init__(self, path, index_path=None):
+        self.path = str(path)
+        candidates = [str(index_path)] if index_path else [self.path + ".idx", self.cached_index_path(self.path)]
+        for self.index_path in candidates:
+            if self._index_is_current():
+                break
+        else:
+            for self.index_path in candidates:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+                    self.build_index(self.path, self.index_path)
+                    break
+                except OSError as exc:
+                    error = exc
+            else:
+                raise error
+        
+        with open(self.path, 'rb') as f:
+            self._words = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(self.path) else b""
+        with open(self.index_path, 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _magic, _size, _mtime, self._count = self.INDEX_HEADER.unpack_from(self._index, 0)
+        if not self._count:
+            raise ValueError(f"Wordlist is empty: {self.path}")
+    
+    @staticmethod
+    def cached_index_path(path):
+        """Index location in the cache directory, keyed by the wordlist's path, size and mtime"""
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode('utf-8', 'surrogateescape')
+        return os.path.join(cache_directory(), "wordlists", hashlib.sha256(key).hexdigest()[:32] + ".idx")
+    
+    def _index_is_current(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                header = f.read(self.INDEX_HEADER.size)
+            magic, size, mtime, _count = self.INDEX_HEADER.unpack(header)
+        except (OSError, struct.error):
+            return False
+        stat = os.stat(self.path)
+        return magic == self.INDEX_MAGIC and size == stat.st_size and mtime == stat.st_mtime_ns
+    
+    @classmethod
+    def build_index(cls, path, index_path=None):
+        """Scan a wordlist once and write its offset index; returns the word count"""
+        path = str(path)
+        index_path = str(index_path) if index_path else path + ".idx"
+        stat = os.stat(path)
+        seen = set()
+        count = 0
+        
+        with open(path, 'rb') as source, _replace_file(index_path) as index:
+            index.write(cls.INDEX_HEADER.pack(cls.INDEX_MAGIC, 0, 0, 0))
+            offset = 0
+            for line in source:
+                start = offset
+                offset += len(line)
+                word = line.rstrip(b"\r\n")
+                diceware = cls.DICEWARE_LINE.match(word)
+                if diceware:
+                    start += diceware.start(1)
+                    word = diceware.group(1)
+                stripped = word.strip()
+                if not stripped or stripped.startswith(b"#"):
+                    continue
+                start += len(word) - len(word.lstrip())
+                word = stripped
+                # Duplicates would make the entropy estimate overstate strength
+                digest = hashlib.blake2b(word, digest_size=16).digest()
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                index.write(cls.INDEX_RECORD.pack(start, len(word)))
+                count += 1
+            index.seek(0)
+            index.write(cls.INDEX_HEADER.pack(cls.INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+        return count
+    
+    def __len__(self):
+        return self._count
+    
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("Wordlist index out of range")
+        start, length = self.INDEX_RECORD.unpack_from(
+            self._index, self.INDEX_HEADER.size + i * self.INDEX_RECORD.size)
+        return self._words[start:start + length].decode('utf-8')
+    
+    def close(self):
+        if isinstance(self._words, mmap.mmap):
+            self._words.close()
+        self._index.close()
+
+
+class PassphraseGenerator:
+    """Diceware-style passphrases drawn uniformly from a Wordlist"""
+    
+    def __init__(self, wordlist, entropy=None):
+        self.wordlist = wordlist
+        self.entropy = entropy if entropy is not None else BufferedOSEntropySource()
+    
+    def entropy_bits(self, words=6):
+        """Exact entropy of a passphrase with the given number of words"""
+        return words * math.log2(len(self.wordlist))
+    
+    def generation_info(self, words=6):
+        """GenerationInfo for passphrases with this many words"""
+        return GenerationInfo(None, words * math.log10(len(self.wordlist)), f"{words} words from {len(self.wordlist):,}")
+    
+    def generate(self, words=6, separator="-"):
+        """Generate one passphrase"""
+        indices = self.entropy.randbelow_many(len(self.wordlist), words)
+        return separator.join(self.wordlist[i] for i in indices)
+    
+    def generate_batch(self, n, words=6, separator="-"):
+        """Generate n passphrases into a PasswordBatch"""
+        indices = self.entropy.randbelow_many(len(self.wordlist), n * words)
+        wordlist = self.wordlist
+        return PasswordBatch.from_passwords(
+            separator.join(wordlist[i] for i in indices[k:k + words])
+            for k in range(0, n * words, words)
+        )
+
+
+class RankedIndex:
+    """Memory-mapped ranked dictionaries: one sorted word table, a rank per dictionary
+    
+    Words are stored sorted, with a byte trie over them for lookups, so
+    opening an index costs nothing and forked workers share its pages.
+    match() walks the trie from each start position and stops as soon as no
+    word continues the substring, which keeps dictionary matching close to
+    the cost of zxcvbn's own dict lookups.
+    """
+    
+    MAGIC = b"SSRKIDX2"
+    # magic, source size, source mtime_ns, words, dictionaries, names length, trie root offset
+    HEADER = struct.Struct('<8sQQIIIQ')
+    # Trie node: word number (-1 if no word ends here), child count; then the
+    # children's byte labels and their node offsets (uint32 each)
+    NODE = struct.Struct('<iH')
+    CHILD = struct.Struct('<I')
+    BYTES = [bytes((b,)) for b in range(256)]
+    
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.source_size, self.source_mtime, count, dictionaries, names_length, self._root = \
+            self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a ranked dictionary index: {self.path}")
+        
+        names_start = self.HEADER.size
+        offsets_start = names_start + ((names_length + 7) & ~7)
+        ranks_start = offsets_start + ((4 * (count + 1) + 7) & ~7)
+        self._words_start = ranks_start + ((4 * count * dictionaries + 7) & ~7)
+        if max(self._words_start, self._root + self.NODE.size) > len(self._map):
+            raise ValueError(f"Truncated ranked dictionary index: {self.path}")
+        
+        self.names = self._map[names_start:names_start + names_length].decode('utf-8').split("\n") if dictionaries else []
+        view = memoryview(self._map)
+        self._offsets = view[offsets_start:offsets_start + 4 * (count + 1)].cast('I')
+        self._ranks = view[ranks_start:ranks_start + 4 * count * dictionaries].cast('I')
+        self._count = count
+    
+    @classmethod
+    def build(cls, path, dictionaries, stamp=(0, 0)):
+        """Write an index for {name: (word, rank) pairs}; stamp is (source size, source mtime_ns)"""
+        names = list(dictionaries)
+        if any("\n" in name for name in names):
+            raise ValueError("Dictionary names must not contain newlines")
+        ranks = {}
+        for k, name in enumerate(names):
+            for word, rank in dictionaries[name]:
+                entry = ranks.get(word)
+                if entry is None:
+                    entry = ranks[word] = [0] * len(names)
+                if not entry[k]:
+                    entry[k] = rank
+        words = sorted(word.encode('utf-8', 'surrogatepass') for word in ranks)
+        
+        encoded_names = "\n".join(names).encode('utf-8')
+        offsets = array('I', [0])
+        blob = bytearray()
+        table = array('I')
+        for word in words:
+            blob += word
+            offsets.append(len(blob))
+            table.extend(ranks[word.decode('utf-8', 'surrogatepass')])
+        del ranks
+        
+        def padded(data):
+            return bytes(data) + bytes(-len(data) % 8)
+        
+        with _replace_file(path) as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, 0, 0, 0, 0, 0, 0))
+            f.write(padded(encoded_names))
+            f.write(padded(offsets.tobytes()))
+            f.write(padded(table.tobytes()))
+            f.write(padded(blob))
+            root = cls._write_trie(f, words)
+            f.seek(0)
+            f.write(cls.HEADER.pack(cls.MAGIC, stamp[0], stamp[1], len(words), len(names), len(encoded_names), root))
+        return len(words)
+    
+    @classmethod
+    def build_from_files(cls, path, files, names=None):
+        """Index word files (one word per line, most common first), one dictionary per file
+        
+        Dictionaries are named after their files unless names are given.
+        Words are lowercased, as zxcvbn matches them; blank lines and
+        lines starting with '#' are skipped. Returns the number of words.
+        """
+        files = [str(file) for file in files]
+        names = list(names) if names else [os.path.splitext(os.path.basename(file))[0] for file in files]
+        if len(names) != len(files):
+            raise ValueError("Give one dictionary name per word file")
+        if len(set(names)) != len(names):
+            raise ValueError("Dictionary names must be unique")
+        
+        def ranked_words(file):
+            rank = 0
+            with open(file, encoding='utf-8', errors='surrogateescape') as f:
+                for line in f:
+                    word = line.strip().lower()
+                    if word and not word.startswith("#"):
+                        rank += 1
+                        yield word, rank
+        
+        return cls.build(path, {name: ranked_words(file) for name, file in zip(names, files)})
+    
+    @classmethod
+    def _write_trie(cls, f, words):
+        """Append the trie over sorted, unique words to f; returns the root's offset
+        
+        Nodes are written children first, so only the path to the current
+        word is held in memory however many words there are.
+        """
+        # Path from the root: [label, child labels, child offsets, word number]
+        path = [[None, bytearray(), array('I'), -1]]
+        base = f.tell()
+        out = bytearray()
+        pack = cls.NODE.pack
+        
+        def finish():
+            nonlocal base
+            label, labels, offsets, number = path.pop()
+            offset = base + len(out)
+            out.extend(pack(number, len(labels)))
+            out.extend(labels)
+            out.extend(offsets.tobytes())
+            if len(out) > 1 << 20:
+                f.write(out)
+                base += len(out)
+                del out[:]
+            if path:
+                path[-1][1].append(label)
+                path[-1][2].append(offset)
+            return offset
+        
+        previous = b""
+        for number, word in enumerate(words):
+            common = 0
+            limit = min(len(previous), len(word))
+            while common < limit and previous[common] == word[common]:
+                common += 1
+            while len(path) > common + 1:
+                finish()
+            for label in word[common:]:
+                path.append([label, bytearray(), array('I'), -1])
+            path[-1][3] = number
+            previous = word
+        while len(path) > 1:
+            finish()
+        root = finish()
+        f.write(out)
+        return root
+    
+    def __len__(self):
+        return self._count
+    
+    def _word(self, k):
+        start = self._words_start
+        return self._map[start + self._offsets[k]:start + self._offsets[k + 1]]
+    
+    def _find(self, key):
+        """Word number of key (bytes), or -1"""
+        words, node_header, child, labels = self._map, self.NODE, self.CHILD, self.BYTES
+        node = self._root
+        number, children = node_header.unpack_from(words, node)
+        for b in key:
+            start = node + 6
+            found = words.find(labels[b], start, start + children)
+            if found < 0:
+                return -1
+            node = child.unpack_from(words, start + children + 4 * (found - start))[0]
+            number, children = node_header.unpack_from(words, node)
+        return number
+    
+    def rank(self, word, dictionary):
+        """Rank of word in dictionary (index into names), or 0 when absent"""
+        number = self._find(word.encode('utf-8', 'surrogatepass'))
+        return self._ranks[number * len(self.names) + dictionary] if number >= 0 else 0
+    
+    def dictionaries(self):
+        """zxcvbn-style {name: mapping of word to rank} backed by this index"""
+        return {name: RankedIndexDictionary(self, k) for k, name in enumerate(self.names)}
+    
+    def match(self, password, wanted):
+        """zxcvbn dictionary matches of password against the dictionaries numbered in wanted
+        
+        wanted is a list of (dictionary number, name) in the order zxcvbn would visit them.
+        """
+        words, node_header, child, labels = self._map, self.NODE, self.CHILD, self.BYTES
+        ranks, width = self._ranks, len(self.names)
+        root = self._root
+        root_children = node_header.unpack_from(words, root)[1]
+        
+        matches = []
+        lowered = password.lower()
+        encoded = [c.encode('utf-8', 'surrogatepass') for c in lowered]
+        length = len(lowered)
+        for i in range(length):
+            node, children = root, root_children
+            for j in range(i, length):
+                for b in encoded[j]:
+                    start = node + 6
+                    found = words.find(labels[b], start, start + children)
+                    if found < 0:
+                        break
+                    node = child.unpack_from(words, start + children + 4 * (found - start))[0]
+                    number, children = node_header.unpack_from(words, node)
+                else:
+                    if number >= 0:
+                        for dictionary, name in wanted:
+                            rank = ranks[number * width + dictionary]
+                            if rank:
+                                matches.append({
+                                    'pattern': 'dictionary',
+                                    'i': i,
+                                    'j': j,
+                                    'token': password[i:j + 1],
+                                    'matched_word': lowered[i:j + 1],
+                                    'rank': rank,
+                                    'dictionary_name': name,
+                                    'reversed': False,
+                                    'l33t': False,
+                                })
+                    continue
+                # No word continues this substring, so longer ones cannot match
+                break
+        return matches
+    
+    def close(self):
+        self._offsets.release()
+        self._ranks.release()
+        self._map.close()
+
+
+class RankedIndexDictionary(Mapping):
+    """One dictionary of a RankedIndex, usable wherever zxcvbn expects a ranked dict"""
+    
+    def __init__(self, index, dictionary):
+        self.index = index
+        self.dictionary = dictionary
+    
+    def __getitem__(self, word):
+        rank = self.index.rank(word, self.dictionary) if isinstance(word, str) else 0
+        if not rank:
+            raise KeyError(word)
+        return rank
+    
+    def __contains__(self, word):
+        return isinstance(word, str) and self.index.rank(word, self.dictionary) > 0
+    
+    def __iter__(self):
+        index, width = self.index, len(self.index.names)
+        for k in range(len(index)):
+            if index._ranks[k * width + self.dictionary]:
+                yield index._word(k).decode('utf-8', 'surrogatepass')
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _dictionary_match(password, _ranked_dictionaries=None):
+    """zxcvbn's dictionary_match, answering RankedIndex-backed dictionaries from their index"""
+    if _ranked_dictionaries is None:
+        _ranked_dictionaries = _zxcvbn.matching.RANKED_DICTIONARIES
+    
+    by_index = OrderedDict()
+    others = {}
+    for name, ranked in _ranked_dictionaries.items():
+        if isinstance(ranked, RankedIndexDictionary):
+            by_index.setdefault(ranked.index, []).append((ranked.dictionary, name))
+        else:
+            others[name] = ranked
+    
+    matches = []
+    for index, wanted in by_index.items():
+        matches.extend(index.match(password, wanted))
+    if others:
+        matches.extend(_zxcvbn_dictionary_match(password, others))
+    # Stable, like zxcvbn's own: dictionaries keep their order within a span
+    return sorted(matches, key=lambda x: (x['i'], x['j']))
+
+
+def _open_zxcvbn_snapshot():
+    """The cached snapshot of zxcvbn's dictionaries, or None if missing or stale"""
+    source = _zxcvbn_snapshot_source()
+    if source is None:
+        return None
+    try:
+        index = RankedIndex(os.path.join(cache_directory(), ZXCVBN_SNAPSHOT_NAME))
+    except (OSError, ValueError, struct.error):
+        return None
+    stat = os.stat(source)
+    if (index.source_size, index.source_mtime) != (stat.st_size, stat.st_mtime_ns):
+        index.close()
+        return None
+    return index
+
+
+def _write_zxcvbn_snapshot(ranked_dictionaries):
+    """Snapshot zxcvbn's freshly built dictionaries for the next process; best effort"""
+    source = _zxcvbn_snapshot_source()
+    if source is None:
+        return
+    stat = os.stat(source)
+    try:
+        os.makedirs(cache_directory(), exist_ok=True)
+        RankedIndex.build(os.path.join(cache_directory(), ZXCVBN_SNAPSHOT_NAME),
+                          {name: ranked.items() for name, ranked in ranked_dictionaries.items()
+                           if name != 'user_inputs'},
+                          (stat.st_size, stat.st_mtime_ns))
+    except OSError:
+        pass
+
+
+def cache_directory():
+    """Per-user cache directory for SecretSauce's derived files"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "secretsauce")
+
+
+def _zxcvbn_snapshot_source():
+    """zxcvbn's frequency list module, whose size and mtime stamp the snapshot"""
+    spec = importlib.util.find_spec('zxcvbn')
+    if spec is None or not spec.origin:
+        return None
+    path = os.path.join(os.path.dirname(spec.origin), "frequency_lists.py")
+    return path if os.path.exists(path) else None
+
+
+class BreachCorpus:
+    """Memory-mapped corpus of breached-password SHA-1 hashes with a Bloom prefilter
+    
+    One file holds a Bloom filter, a table of where each 16-bit hash prefix
+    starts, and the sorted (SHA-1, times seen) records. Most passwords that
+    are not in the corpus are rejected by the filter alone; the rest are
+    confirmed by a binary search within their prefix's records. Nothing is
+    read until it is used, so memory use is the pages that lookups touch.
+    """
+    
+    MAGIC = b"SSBRCH01"
+    HEADER = struct.Struct('<8sQQII')   # magic, records, Bloom filter bits, Bloom hashes, reserved
+    RECORD = struct.Struct('<20sI')     # SHA-1 digest, times seen
+    PREFIXES = 1 << 16
+    # Breach dumps list "SHA1HEX" or "SHA1HEX:count" per line
+    DUMP_LINE = re.compile(rb'^\s*([0-9A-Fa-f]{40})(?::(\d+))?\s*$')
+    MASK64 = (1 << 64) - 1
+    
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._bits, self._hashes, _reserved = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a breach corpus: {self.path}")
+        
+        position = self.HEADER.size
+        self._prefixes = memoryview(self._map)[position:position + 8 * (self.PREFIXES + 1)].cast('Q')
+        self._bloom = position + 8 * (self.PREFIXES + 1)
+        self._records = self._bloom + self._bits // 8
+        # How lookups were decided: 'filtered' by the Bloom filter, 'absent' after
+        # a search (a false positive of the filter) or 'found'
+        self.stats = Counter()
+    
+    @classmethod
+    def _bloom_positions(cls, digest, bits, hashes):
+        h1, h2 = struct.unpack_from('<QQ', digest, 4)
+        h2 |= 1
+        return [((h1 + i * h2) & cls.MASK64) % bits for i in range(hashes)]
+    
+    @classmethod
+    def _set_bloom_bits(cls, bloom, records, bits, hashes):
+        """Add every record in a bytes blob of RECORDs to the Bloom filter"""
+        if load_numpy() is None:
+            for start in range(0, len(records), cls.RECORD.size):
+                for position in cls._bloom_positions(records[start:start + 20], bits, hashes):
+                    bloom[position >> 3] |= 1 << (position & 7)
+            return
+        rows = np.frombuffer(records, dtype=np.uint8).reshape(-1, cls.RECORD.size)
+        h1 = rows[:, 4:12].copy().view('<u8').ravel()
+        h2 = rows[:, 12:20].copy().view('<u8').ravel() | np.uint64(1)
+        target = np.frombuffer(bloom, dtype=np.uint8)
+        for i in range(hashes):
+            # uint64 arithmetic wraps like the & MASK64 in _bloom_positions
+            position = (h1 + np.uint64(i) * h2) % np.uint64(bits)
+            np.bitwise_or.at(target, (position >> np.uint64(3)).astype(np.intp),
+                             (np.uint8(1) << (position & np.uint64(7)).astype(np.uint8)))
+    
+    @classmethod
+    def build(cls, path, sources, bits_per_entry=10, run_size=1 << 21):
+        """Convert raw SHA-1 dumps into a corpus file; returns (records, skipped lines)
+        
+        Dumps may be in any order and may repeat hashes (their counts are
+        added). They are sorted externally in runs of run_size records, so
+        memory use does not depend on the size of the dump.
+        """
+        import tempfile
+        path = str(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        if bits_per_entry < 1:
+            raise ValueError("Bloom filter bits per entry must be at least 1")
+        runs = []
+        parsed = skipped = 0
+        pack, match = cls.RECORD.pack, cls.DUMP_LINE.match
+        try:
+            records = []
+            
+            def write_run():
+                records.sort()
+                fd, run_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".run", dir=directory)
+                runs.append(run_path)
+                with os.fdopen(fd, 'wb') as run:
+                    run.write(b"".join(records))
+                records.clear()
+            
+            for source in sources:
+                with open(source, 'rb') as f:
+                    for line in f:
+                        found = match(line)
+                        if found is None:
+                            skipped += bool(line.strip())
+                            continue
+                        count = int(found.group(2)) if found.group(2) else 1
+                        records.append(pack(bytes.fromhex(found.group(1).decode('ascii')), min(count, 0xFFFFFFFF)))
+                        parsed += 1
+                        if len(records) >= run_size:
+                            write_run()
+            if records:
+                write_run()
+            if not parsed:
+                raise ValueError("No SHA-1 hashes found in the breach dump")
+            
+            # Sized for every parsed line; duplicates only lower the false positive rate
+            bits = max(64, (parsed * bits_per_entry + 63) // 64 * 64)
+            hashes = max(1, round(bits / parsed * math.log(2)))
+            bloom = bytearray(bits // 8)
+            prefix_counts = array('Q', bytes(8 * (cls.PREFIXES + 1)))
+            
+            def read_run(run_path):
+                with open(run_path, 'rb') as run:
+                    while True:
+                        block = run.read(cls.RECORD.size * 4096)
+                        if not block:
+                            return
+                        for start in range(0, len(block), cls.RECORD.size):
+                            yield block[start:start + cls.RECORD.size]
+            
+            count = 0
+            with _replace_file(path) as f:
+                f.write(bytes(cls.HEADER.size + 8 * (cls.PREFIXES + 1) + len(bloom)))
+                out = bytearray()
+                previous, seen = None, 0
+                for record in heapq.merge(*(read_run(run_path) for run_path in runs)):
+                    digest, times = cls.RECORD.unpack(record)
+                    if digest == previous:
+                        seen = min(seen + times, 0xFFFFFFFF)
+                        continue
+                    if previous is not None:
+                        out += pack(previous, seen)
+                        prefix_counts[(previous[0] << 8 | previous[1]) + 1] += 1
+                        count += 1
+                    previous, seen = digest, times
+                    if len(out) >= cls.RECORD.size * 65536:
+                        cls._set_bloom_bits(bloom, out, bits, hashes)
+                        f.write(out)
+                        out = bytearray()
+                out += pack(previous, seen)
+                prefix_counts[(previous[0] << 8 | previous[1]) + 1] += 1
+                count += 1
+                cls._set_bloom_bits(bloom, out, bits, hashes)
+                f.write(out)
+                
+                for prefix in range(cls.PREFIXES):
+                    prefix_counts[prefix + 1] += prefix_counts[prefix]
+                f.seek(0)
+                f.write(cls.HEADER.pack(cls.MAGIC, count, bits, hashes, 0))
+                f.write(prefix_counts.tobytes())
+                f.write(bloom)
+        finally:
+            for run_path in runs:
+                try:
+                    os.remove(run_path)
+                except OSError:
+                    pass
+        return count, skipped
+    
+    def __len__(self):
+        return self._count
+    
+    def lookup(self, password):
+        """Times password appears in the corpus, 0 when it does not"""
+        return self.lookup_digest(hashlib.sha1(password.encode('utf-8', 'surrogatepass')).digest())
+    
+    def lookup_digest(self, digest):
+        """Times a SHA-1 digest appears in the corpus, 0 when it does not"""
+        corpus, bloom = self._map, self._bloom
+        for position in self._bloom_positions(digest, self._bits, self._hashes):
+            if not corpus[bloom + (position >> 3)] & (1 << (position & 7)):
+                self.stats['filtered'] += 1
+                return 0
+        
+        prefix = digest[0] << 8 | digest[1]
+        low, high = self._prefixes[prefix], self._prefixes[prefix + 1]
+        size, records = self.RECORD.size, self._records
+        while low < high:
+            middle = (low + high) // 2
+            start = records + middle * size
+            found = corpus[start:start + 20]
+            if found < digest:
+                low = middle + 1
+            elif found > digest:
+                high = middle
+            else:
+                self.stats['found'] += 1
+                return self.RECORD.unpack_from(corpus, start)[1]
+        self.stats['absent'] += 1
+        return 0
+    
+    def false_positive_rate(self):
+        """Expected share of absent passwords that the Bloom filter lets through"""
+        if not self._count:
+            return 0.0
+        return (1 - math.exp(-self._hashes * self._count / self._bits)) ** self._hashes
+    
+    def close(self):
+        self._prefixes.release()
+        self._map.close()
+
+
+class ReuseIndex:
+    """Exact and near-duplicate password reuse across a vault, without keeping passwords
+    
+    Exact reuse is found through HMAC digests under a random per-index key.
+    Near-duplicates such as Summer2023! and Summer2024! are found through
+    MinHash signatures over character n-grams, split into bands for LSH:
+    only passwords that agree on a whole band are compared, and within a
+    band each one is compared with at most `window` earlier ones, so the
+    work grows linearly with the vault instead of with the number of pairs.
+    """
+    
+    NGRAM = 3
+    # 96 16-bit MinHash values per password, in 32 LSH bands of 3. Passwords
+    # with a Jaccard similarity of 0.5 share a band with 98.6% probability,
+    # 0.6 with 99.9%, while pairs that only share an n-gram or two almost
+    # never do
+    SIGNATURE = 96
+    BANDS = 32
+    ROWS = 3
+    
+    def __init__(self, threshold=0.4, window=4):
+        if not 0 < threshold <= 1:
+            raise ValueError("Similarity threshold must be between 0 and 1")
+        self.threshold = threshold
+        self.window = window
+        self._key = os.urandom(32)
+        # Each keyed hasher gives 64 bytes, 32 of the 16-bit values per n-gram
+        self._hashers = [hashlib.blake2b(key=self._key, person=b"minhash%d" % k)
+                         for k in range(self.SIGNATURE // 32)]
+        self._digests = {}
+        self._entries = array('I')       # entry number -> unique password number
+        self._signatures = array('H')    # SIGNATURE values per unique password
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def add(self, password):
+        """Record one vault entry; returns (unique password number, whether it is new)"""
+        digest = hmac.new(self._key, password.encode('utf-8', 'surrogatepass'), hashlib.sha256).digest()[:16]
+        unique = self._digests.get(digest)
+        new = unique is None
+        if new:
+            unique = self._digests[digest] = len(self._digests)
+            self._signatures.extend(self._signature(password))
+        self._entries.append(unique)
+        return unique, new
+    
+    def _signature(self, password):
+        """MinHash of the password's lowercased n-grams, each hashed under the index key"""
+        text = "\x02" + password.lower() + "\x03"
+        grams = {text[i:i + self.NGRAM] for i in range(max(1, len(text) - self.NGRAM + 1))}
+        hashed = bytearray()
+        for gram in grams:
+            data = gram.encode('utf-8', 'surrogatepass')
+            for hasher in self._hashers:
+                h = hasher.copy()
+                h.update(data)
+                hashed += h.digest()
+        if load_numpy() is not None:
+            return array('H', np.frombuffer(hashed, dtype='<u2').reshape(len(grams), self.SIGNATURE)
+                         .min(axis=0).tobytes())
+        hashes = array('H', hashed)
+        if len(grams) == 1:
+            return hashes
+        width = self.SIGNATURE
+        return map(min, *(hashes[start:start + width] for start in range(0, len(hashes), width)))
+    
+    def similarity(self, a, b):
+        """Estimated Jaccard similarity of two unique passwords' n-grams"""
+        width = self.SIGNATURE
+        first = self._signatures[a * width:(a + 1) * width]
+        second = self._signatures[b * width:(b + 1) * width]
+        return sum(map(int.__eq__, first, second)) / width
+    
+    def _near_duplicate_roots(self):
+        """Union-find root for each unique password, joining near-duplicates"""
+        count = len(self._digests)
+        parent = array('I', range(count))
+        
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        
+        stride = 2 * self.SIGNATURE
+        band_size = 2 * self.ROWS
+        signatures = self._signatures.tobytes()
+        for offset in range(0, self.BANDS * band_size, band_size):
+            # Most passwords share no band with any other: one lookup each
+            recent = {}
+            for u, key in enumerate(signatures[start:start + band_size]
+                                    for start in range(offset, len(signatures), stride)):
+                others = recent.get(key)
+                if others is None:
+                    recent[key] = [u]
+                    continue
+                for other in others:
+                    root, other_root = find(u), find(other)
+                    if root != other_root and self.similarity(u, other) >= self.threshold:
+                        parent[max(root, other_root)] = min(root, other_root)
+                others.append(u)
+                if len(others) > self.window:
+                    del others[0]
+        return [find(u) for u in range(count)]
+    
+    def groups(self):
+        """Per entry: (exact reuse group, near-duplicate group), numbered from 1, or None if alone
+        
+        Near-duplicate groups hold at least two different passwords; entries
+        that only repeat the same password are reported as exact reuse.
+        """
+        uses = Counter(self._entries)
+        roots = self._near_duplicate_roots()
+        passwords_per_root = Counter(roots)
+        
+        reuse_ids, similar_ids = {}, {}
+        result = []
+        for unique in self._entries:
+            reuse = similar = None
+            if uses[unique] > 1:
+                reuse = reuse_ids.setdefault(unique, len(reuse_ids) + 1)
+            root = roots[unique]
+            if passwords_per_root[root] > 1:
+                similar = similar_ids.setdefault(root, len(similar_ids) + 1)
+            result.append((reuse, similar))
+        return result
+
+
+class AnalysisResult:
+    """Slim analysis result: score, log10 guesses and feedback, patterns on demand
+    
+    Holds a few scalars instead of zxcvbn's full result (match dicts,
+    Decimal guesses and timing data). get() and [] accept the zxcvbn key
+    names used by the GUI and report code, so either form can be passed
+    around.
+    """
+    
+    __slots__ = ('score', 'guesses_log10', 'warning', 'suggestions', 'kind', 'note', 'breached', '_guesses',
+                 '_patterns')
+    
+    def __init__(self, score, guesses_log10, warning="", suggestions=(), kind='zxcvbn', note="", patterns=(),
+                 guesses=None, breached=None):
+        self.score = score
+        self.guesses_log10 = guesses_log10
+        self.warning = warning
+        self.suggestions = tuple(suggestions)
+        self.kind = kind          # 'zxcvbn', 'approximate' or 'analytic'
+        self.note = note          # approximation or generation description
+        self._patterns = patterns  # tuple of (pattern, token, dictionary_name)
+        self._guesses = guesses
+        self.breached = breached  # times seen in the breach corpus; None when not checked
+    
+    @classmethod
+    def from_analysis(cls, analysis, max_patterns=5):
+        """Compact a zxcvbn-style result dict; max_patterns=0 skips the sequence, None keeps all of it"""
+        guesses = analysis.get('guesses', 0)
+        try:
+            guesses = float(guesses)
+        except (TypeError, ValueError, OverflowError):
+            guesses = None
+        if 'guesses_log10' in analysis:
+            guesses_log10 = analysis['guesses_log10']
+        else:
+            try:
+                guesses_log10 = math.log10(analysis.get('guesses', 0))
+            except (TypeError, ValueError):
+                guesses_log10 = None
+        
+        feedback = analysis.get('feedback', {})
+        if analysis.get('analytic'):
+            kind, note = 'analytic', analysis.get('generation', "")
+        elif analysis.get('approximate'):
+            kind, note = 'approximate', analysis.get('approximation', "")
+        else:
+            kind, note = 'zxcvbn', ""
+        patterns = tuple((m.get('pattern', 'unknown'), m.get('token', ''), m.get('dictionary_name'))
+                         for m in analysis.get('sequence', [])[:max_patterns])
+        return cls(analysis.get('score', 0), guesses_log10, feedback.get('warning', ''),
+                   feedback.get('suggestions', []), kind, note, patterns, guesses, analysis.get('breached'))
+    
+    @property
+    def guesses(self):
+        if self._guesses is not None:
+            return self._guesses
+        if self.guesses_log10 is None:
+            return 0
+        return 10 ** self.guesses_log10 if self.guesses_log10 < 308 else float('inf')
+    
+    @property
+    def patterns(self):
+        return self._patterns
+    
+    def clear(self):
+        """Drop everything derived from the password text"""
+        self.warning = ""
+        self.suggestions = ()
+        self._patterns = ()
+    
+    def get(self, key, default=None):
+        if key == 'score':
+            return self.score
+        if key == 'guesses':
+            return self.guesses
+        if key == 'guesses_log10':
+            return default if self.guesses_log10 is None else self.guesses_log10
+        if key == 'feedback':
+            return {'warning': self.warning, 'suggestions': list(self.suggestions)}
+        if key == 'sequence':
+            # Built on request only; most consumers never look at patterns
+            return [dict({'pattern': p, 'token': t}, **({'dictionary_name': d} if d else {}))
+                    for p, t, d in self._patterns]
+        if key == 'approximate':
+            return self.kind == 'approximate'
+        if key == 'analytic':
+            return self.kind == 'analytic'
+        if key in ('approximation', 'generation'):
+            return self.note
+        if key == 'breached':
+            return default if self.breached is None else self.breached
+        return default
+    
+    def __getitem__(self, key):
+        value = self.get(key, KeyError)
+        if value is KeyError:
+            raise KeyError(key)
+        return value
+    
+    def __repr__(self):
+        return f"AnalysisResult(score={self.score}, guesses_log10={self.guesses_log10}, kind={self.kind!r})"
+
+
+class AnalysisCache:
+    """Bounded LRU cache of AnalysisResults with an optional TTL
+    
+    Keys are HMAC-SHA256 digests under a random per-process key and pattern
+    tokens are kept as offsets, so no password text is held. Thread-safe.
+    """
+    
+    def __init__(self, maxsize=1024, ttl=None):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key = os.urandom(32)
+    
+    def _digest(self, password, namespace):
+        data = namespace.encode('ascii') + b"\0" + password.encode('utf-8', 'surrogatepass')
+        return hmac.new(self._key, data, hashlib.sha256).digest()
+    
+    def get(self, password, max_patterns=5, namespace=""):
+        """Return a fresh AnalysisResult for password, or None on a miss
+        
+        Entries in different namespaces never answer for each other, so
+        partial results (bounded-analysis windows) cannot stand in for a
+        whole password's analysis.
+        """
+        key = self._digest(password, namespace)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() >= entry[0]:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        stored = entry[1]
+        patterns = tuple((pattern, password[start:end], name)
+                         for pattern, start, end, name in stored.patterns[:max_patterns])
+        return AnalysisResult(stored.score, stored.guesses_log10, stored.warning, stored.suggestions,
+                              stored.kind, stored.note, patterns, stored._guesses, stored.breached)
+    
+    def put(self, password, result, namespace=""):
+        """Store a copy of result with its tokens reduced to offsets into password"""
+        spans = []
+        position = 0
+        for pattern, token, name in result.patterns:
+            start = password.find(token, position)
+            if start < 0:
+                start = password.find(token)
+            if start < 0:
+                continue  # token from rewritten text (bounded analysis) - drop it
+            position = start + len(token)
+            spans.append((pattern, start, position, name))
+        stored = AnalysisResult(result.score, result.guesses_log10, result.warning, result.suggestions,
+                                result.kind, result.note, tuple(spans), result._guesses, result.breached)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        key = self._digest(password, namespace)
+        with self._lock:
+            self._entries[key] = (expires, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries and rotate the HMAC key"""
+        with self._lock:
+            self._entries.clear()
+            self._key = os.urandom(32)
+    
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'expirations': self.expirations}
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class ValidationResult:
+    """Outcome of PasswordAnalyzer.validate and the stage that decided it"""
+    
+    __slots__ = ('valid', 'stage', 'score', 'guesses_log10')
+    
+    def __init__(self, valid, stage, score=None, guesses_log10=None):
+        self.valid = valid
+        self.stage = stage                  # one of PasswordAnalyzer.VALIDATION_STAGES
+        self.score = score                  # None when a prefilter decided
+        self.guesses_log10 = guesses_log10  # bound or estimate behind the decision
+    
+    def __bool__(self):
+        return self.valid
+    
+    def __repr__(self):
+        return f"ValidationResult(valid={self.valid}, stage={self.stage!r}, score={self.score})"
 
 
 class PasswordAnalyzer:
     """Password analyzer using zxcvbn"""
     
-    def __init__(self):
-        pass
+    # More realistic attack scenarios (guesses per second) for modern hardware
+    ATTACK_SCENARIOS = {
+        'Single CPU (Basic)': 1e5,           # 100K guesses/sec
+        'Single CPU (Optimized)': 1e7,       # 10M guesses/sec  
+        'Single GPU (RTX 4090)': 1e11,       # 100B guesses/sec
+        'GPU Cluster (10 GPUs)': 1e12,       # 1T guesses/sec
+        'GPU Cluster (100 GPUs)': 1e13,      # 10T guesses/sec
+        'Massive GPU Array (1K GPUs)': 1e14, # 100T guesses/sec
+        'Massive GPU Array (10K GPUs)': 1e15, # 1P guesses/sec
+        'Massive GPU Array (100K GPUs)': 1e16, # 10P guesses/sec
+    }
+    
+    # zxcvbn's score thresholds, as log10(guesses)
+    SCORE_THRESHOLDS = (3, 6, 8, 10)
+    # Cheapest first; 'zxcvbn' is the full (expensive) analysis
+    VALIDATION_STAGES = ('length', 'breached', 'common', 'analytic', 'fast_accept', 'zxcvbn')
+    # Fast accept needs this many non-repeated characters per order of magnitude required
+    FAST_ACCEPT_CHARS_PER_ORDER = 4
+    
+    # Allowance per window boundary for a pattern that would have spanned it
+    BOUNDARY_SLACK_LOG10 = 8.0
+    
+    def __init__(self, exact_length=64, window=16, length_budget=1024, time_budget=None, cross_check=False,
+                 cache=None, dictionaries=(), breach_corpus=None):
+        # Inputs longer than exact_length use bounded-cost analysis: zxcvbn
+        # (whose matching cost grows superlinearly) runs on windows of
+        # `window` characters, stopping after `length_budget` characters.
+        # An optional `time_budget` in seconds also stops it early; results
+        # then depend on machine load, so only interactive callers set it
+        self.exact_length = exact_length
+        self.window = window
+        # With generation metadata, also run zxcvbn and attach its verdict
+        self.cross_check = cross_check
+        # How often each validation stage made the decision
+        self.validation_stats = Counter()
+        self.length_budget = length_budget
+        self.time_budget = time_budget
+        # Optional AnalysisCache consulted by analyze() and validate()
+        self.cache = cache
+        # Organization dictionaries (RankedIndex objects or index paths, see
+        # the index-dictionary command), matched alongside zxcvbn's own lists
+        self.dictionaries = [d if isinstance(d, RankedIndex) else RankedIndex(d) for d in dictionaries]
+        self._ranked_dictionaries = None
+        # Optional BreachCorpus (or its path, see the index-breaches command);
+        # breached passwords are flagged and never validate
+        if breach_corpus is not None and not isinstance(breach_corpus, BreachCorpus):
+            breach_corpus = BreachCorpus(breach_corpus)
+        self.breach_corpus = breach_corpus
     
-    def analyze_password(self, password):
-        """Analyze password using zxcvbn"""
+    def analyze_password(self, password, info=None):
+        """Analyze password using zxcvbn, or in O(1) from GenerationInfo when given"""
+        result = self._analyze_password(password, info)
+        if self.breach_corpus is not None and password:
+            self._check_breached(password, result)
+        return result
+    
+    def _analyze_password(self, password, info):
+        if info is not None and password and (info.length is None or info.length == len(password)):
+            return self.analyze_generated(password, info)
+        
         if not password:
             return {
                 'score': 0,
@@ -302,15 +2337,335 @@ class PasswordAnalyzer:
                 'sequence': []
             }
         
-        result = zxcvbn(password)
+        if len(password) > self.exact_length:
+            return self.analyze_bounded(password)
+        
+        result = self._zxcvbn(password)
+        return result
+    
+    def _check_breached(self, password, result):
+        """Flag a password found in the breach corpus and cap its guesses at the corpus size
+        
+        Breach corpora are standard cracking wordlists: an attacker running
+        through the whole corpus needs at most that many guesses.
+        """
+        times = self.breach_corpus.lookup(password)
+        result['breached'] = times
+        if not times:
+            return
+        bound = math.log10(len(self.breach_corpus))
+        if self._guesses_log10(result) > bound:
+            result['guesses'] = float(len(self.breach_corpus))
+            result['guesses_log10'] = bound
+            result['score'] = min(result['score'], self._score_from_log10(bound))
+        plural = "s" if times != 1 else ""
+        result['feedback'] = dict(result.get('feedback', {}),
+                                  warning=f"This password appears in breached password lists ({times:,} time{plural})")
+    
+    def ranked_dictionaries(self):
+        """zxcvbn's ranked dictionaries plus this analyzer's organization dictionaries"""
+        if self._ranked_dictionaries is None:
+            ranked = dict(load_zxcvbn().matching.RANKED_DICTIONARIES, user_inputs={})
+            for index in self.dictionaries:
+                for name, dictionary in index.dictionaries().items():
+                    if name in ranked:
+                        raise ValueError(f"Dictionary name '{name}' in {index.path} is already in use")
+                    ranked[name] = dictionary
+            self._ranked_dictionaries = ranked
+        return self._ranked_dictionaries
+    
+    def _zxcvbn(self, password):
+        """zxcvbn(password), matching the organization dictionaries as well
+        
+        zxcvbn() itself always matches against the module-wide dictionaries,
+        so with organization dictionaries its pipeline runs here on this
+        analyzer's own set; nothing global changes and threads can share it.
+        """
+        zxcvbn = load_zxcvbn()
+        if not self.dictionaries:
+            return zxcvbn.zxcvbn(password)
+        
+        matches = zxcvbn.matching.omnimatch(password, self.ranked_dictionaries())
+        result = zxcvbn.scoring.most_guessable_match_sequence(password, matches)
+        result.update(zxcvbn.time_estimates.estimate_attack_times(result['guesses']))
+        result['feedback'] = zxcvbn.feedback.get_feedback(result['score'], result['sequence'])
+        return result
+    
+    def analyze(self, password, info=None, max_patterns=5):
+        """Like analyze_password, but return a compact AnalysisResult, cached when a cache is set"""
+        if self.cache is None or info is not None or not password:
+            return AnalysisResult.from_analysis(self.analyze_password(password, info), max_patterns)
+        
+        result = self.cache.get(password, max_patterns)
+        if result is None:
+            analysis = self.analyze_password(password)
+            result = AnalysisResult.from_analysis(analysis, max_patterns)
+            # A timed-out result depends on load; the next call may get further.
+            # The cache keeps every pattern, so callers asking for more than
+            # this one did still get them; get() truncates to max_patterns
+            if not analysis.get('timed_out'):
+                self.cache.put(password, AnalysisResult.from_analysis(analysis, None))
         return result
     
+    def validate(self, password, min_score=3, info=None):
+        """Decide "score >= min_score?" running full zxcvbn only when cheap checks cannot
+        
+        Rejections by the length and common-password stages are exact: they
+        use upper bounds on what zxcvbn could report. The fast accept is a
+        heuristic for passwords far above the bar (long, diverse, no
+        repeats, sequences or keyboard walks); validation_stats shows how
+        often each stage decides.
+        """
+        result = self._validate(password, min_score, info)
+        self.validation_stats[result.stage] += 1
+        return result
+    
+    def _validate(self, password, min_score, info):
+        if min_score <= 0:
+            return ValidationResult(True, 'length')
+        required_log10 = self.SCORE_THRESHOLDS[min(min_score, 4) - 1]
+        
+        # zxcvbn never reports more than ~10 guesses per character (all brute force)
+        if len(password) < required_log10:
+            return ValidationResult(False, 'length', guesses_log10=len(password))
+        
+        # A breached password is in every attacker's wordlist, whatever it scores
+        if self.breach_corpus is not None and self.breach_corpus.lookup(password):
+            return ValidationResult(False, 'breached')
+        
+        # An exact dictionary hit scores at most rank x capitalization variants
+        zxcvbn = load_zxcvbn()
+        rank = min((ranked[password.lower()] for ranked in self.ranked_dictionaries().values()
+                    if password.lower() in ranked), default=None)
+        if rank is not None:
+            bound = math.log10(rank * zxcvbn.scoring.uppercase_variations({'token': password}) + 1)
+            if bound < required_log10:
+                return ValidationResult(False, 'common', guesses_log10=bound)
+        
+        if info is not None and (info.length is None or info.length == len(password)):
+            analysis = self.analyze_generated(password, info)
+            return ValidationResult(analysis['score'] >= min_score, 'analytic',
+                                    analysis['score'], analysis['guesses_log10'])
+        
+        if self._far_above(password, required_log10):
+            return ValidationResult(True, 'fast_accept')
+        
+        analysis = self.analyze(password)
+        return ValidationResult(analysis.score >= min_score, 'zxcvbn',
+                                analysis.score, analysis.guesses_log10)
+    
+    def _far_above(self, password, required_log10):
+        """Heuristic: clearly strong enough without pattern matching"""
+        novel = self._novel_text(password)
+        if len(novel) < self.FAST_ACCEPT_CHARS_PER_ORDER * required_log10 + 4:
+            return False
+        classes = sum(1 for test in (str.islower, str.isupper, str.isdigit)
+                      if any(test(c) for c in novel))
+        classes += any(not c.isalnum() for c in novel)
+        if classes < 3 or len(set(novel)) * 2 < len(novel):
+            return False
+        # Sequences (abcd, 9753) and keyboard walks are cheap to find and cheap to guess
+        matching = load_zxcvbn().matching
+        if any(m['j'] - m['i'] >= 3 for m in matching.sequence_match(password) +
+               matching.spatial_match(password)):
+            return False
+        # Internal vocabulary is exactly what a targeted attacker tries first
+        return not any(m['j'] - m['i'] >= 3 for index in self.dictionaries
+                       for m in index.match(password, list(enumerate(index.names))))
+    
+    def analyze_generated(self, password, info):
+        """Closed-form analysis of a SecretSauce-generated password
+        
+        The attacker is assumed to know exactly how the password was made, so
+        the guess count is the full size of the generator's output space.
+        """
+        log10_guesses = info.log10_space
+        result = {
+            'password': password,
+            'score': self._score_from_log10(log10_guesses),
+            'guesses': 10 ** log10_guesses if log10_guesses < 308 else float('inf'),
+            'guesses_log10': log10_guesses,
+            'feedback': {'warning': '', 'suggestions': []},
+            'sequence': [],
+            'analytic': True,
+            'generation': info.source,
+        }
+        if self.cross_check:
+            check = self.analyze_password(password)
+            result['zxcvbn_score'] = check['score']
+            result['zxcvbn_guesses_log10'] = self._guesses_log10(check)
+            result['sequence'] = check.get('sequence', [])
+        return result
+    
+    def analyze_bounded(self, password):
+        """Approximate analysis of a long password as a conservative lower bound
+        
+        Stretches that repeat earlier text are dropped first (an LZ77-style
+        parse), so repetition can never add strength. What is left is cut into
+        windows whose log10 guesses are summed, each boundary giving up
+        BOUNDARY_SLACK_LOG10 for a pattern that might have spanned it. Work
+        stops at the length or time budget; unanalyzed text adds nothing.
+        Results cut short by the time budget are marked 'timed_out'.
+        """
+        deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        timed_out = False
+        analyzed = min(len(password), self.length_budget)
+        novel = self._novel_text(password[:analyzed])
+        
+        seen = set()
+        window_logs = []
+        sequence = []
+        feedback = {}
+        min_score = None
+        
+        for start in range(0, len(novel), self.window):
+            if deadline is not None and window_logs and time.monotonic() > deadline:
+                # Report only the part of the input the windows actually covered
+                analyzed = min(analyzed, self._covered_length(password, novel[:start]))
+                timed_out = True
+                break
+            chunk = novel[start:start + self.window]
+            if chunk in seen:
+                continue
+            seen.add(chunk)
+            
+            result = self._window_analysis(chunk)
+            window_logs.append(self._guesses_log10(result))
+            if min_score is None or result['score'] < min_score:
+                feedback, min_score = result.get('feedback', {}), result['score']
+            for match in result.get('sequence', []):
+                sequence.append(dict(match, i=match['i'] + start, j=match['j'] + start))
+        
+        log10_guesses = window_logs[0] + sum(max(0.0, w - self.BOUNDARY_SLACK_LOG10) for w in window_logs[1:])
+        result = self._bounded_result(password, log10_guesses, feedback, sequence, analyzed, len(window_logs))
+        if timed_out:
+            result['timed_out'] = True
+        return result
+    
+    def _window_analysis(self, chunk):
+        """zxcvbn on one window, reusing cached results for windows seen before
+        
+        With a cache, re-analyzing text that only changed at the end (typing,
+        or a paste being edited) runs zxcvbn on the changed windows alone.
+        """
+        if self.cache is None:
+            return self._zxcvbn(chunk)
+        
+        # Windows get no breach check, so they must never answer analyze() lookups
+        result = self.cache.get(chunk, self.window, namespace='window')
+        if result is None:
+            result = AnalysisResult.from_analysis(self._zxcvbn(chunk), self.window)
+            self.cache.put(chunk, result, namespace='window')
+        sequence = []
+        position = 0
+        for match in result.get('sequence'):
+            i = chunk.find(match['token'], position)
+            position = i + len(match['token'])
+            sequence.append(dict(match, i=i, j=position - 1))
+        return {'score': result.score, 'guesses_log10': result.guesses_log10,
+                'feedback': result.get('feedback'), 'sequence': sequence}
+    
+    @staticmethod
+    def _novel_text(text, min_match=4, candidates=16):
+        """Return text with every stretch that repeats earlier text removed"""
+        positions = {}
+        
+        def remember(k):
+            key = text[k:k + min_match]
+            if len(key) == min_match:
+                bucket = positions.setdefault(key, deque(maxlen=candidates))
+                bucket.append(k)
+        
+        novel = []
+        i = 0
+        while i < len(text):
+            best = 0
+            for j in positions.get(text[i:i + min_match], ()):
+                length = 0
+                # j < i, so the copy may overlap the text being matched (runs)
+                while i + length < len(text) and text[j + length] == text[i + length]:
+                    length += 1
+                best = max(best, length)
+            if best >= min_match:
+                for k in range(i, i + best):
+                    remember(k)
+                i += best
+            else:
+                novel.append(text[i])
+                remember(i)
+                i += 1
+        return "".join(novel)
+    
+    def _covered_length(self, password, novel_prefix):
+        """Length of the shortest prefix of password whose novel text starts with novel_prefix"""
+        low, high = len(novel_prefix), min(len(password), self.length_budget)
+        while low < high:
+            middle = (low + high) // 2
+            if len(self._novel_text(password[:middle])) >= len(novel_prefix):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+    
+    def _bounded_result(self, password, log10_guesses, feedback, sequence, analyzed, windows):
+        """Assemble a zxcvbn-shaped result for a bounded analysis"""
+        note = (f"Approximate: analyzed {analyzed:,} of {len(password):,} characters "
+                f"in {windows} window{'s' if windows != 1 else ''} (conservative lower bound)")
+        return {
+            'password': password,
+            'score': self._score_from_log10(log10_guesses),
+            'guesses': 10 ** log10_guesses if log10_guesses < 308 else float('inf'),
+            'guesses_log10': log10_guesses,
+            'feedback': {'warning': feedback.get('warning', ''),
+                         'suggestions': list(feedback.get('suggestions', []))},
+            'sequence': sequence,
+            'approximate': True,
+            'approximation': note,
+            'analyzed_length': analyzed,
+        }
+    
+    @staticmethod
+    def _guesses_log10(analysis):
+        if analysis.get('guesses_log10') is not None:
+            return analysis['guesses_log10']
+        guesses = analysis.get('guesses', 0)
+        try:
+            return math.log10(guesses) if guesses > 0 else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def _score_from_log10(self, log10_guesses):
+        return sum(1 for threshold in self.SCORE_THRESHOLDS if log10_guesses >= threshold)
+    
+    def to_record(self, analysis):
+        """Flatten an analysis into a JSON-serializable summary"""
+        guesses_log10 = self._guesses_log10(analysis)
+        record = {
+            'score': analysis.get('score', 0),
+            'guesses': float(analysis.get('guesses', 0)) if guesses_log10 < 308 else float('inf'),
+            'guesses_log10': round(guesses_log10, 4),
+            'crack_times': self.get_crack_time_estimates(analysis),
+            'warning': analysis.get('feedback', {}).get('warning', ''),
+        }
+        if analysis.get('approximate'):
+            record['approximate'] = True
+        if analysis.get('analytic'):
+            record['analytic'] = True
+        if analysis.get('breached') is not None:
+            record['breached'] = analysis['breached']
+        return record
+    
     def get_crack_time_estimates(self, analysis):
         """Get crack time estimates for different scenarios"""
         base_guesses = analysis.get('guesses', 0)
         if base_guesses == 0:
             return {}
         
+        # Beyond float range, work with the logarithm instead
+        if analysis.get('guesses_log10', 0) >= 300:
+            return {scenario: self._format_log_time(analysis['guesses_log10'] - math.log10(2 * rate))
+                    for scenario, rate in self.ATTACK_SCENARIOS.items()}
+        
         # Convert to float if it's a Decimal object
         try:
             base_guesses = float(base_guesses)
@@ -320,25 +2675,22 @@ class PasswordAnalyzer:
         if base_guesses == 0:
             return {}
         
-        # More realistic attack scenarios (guesses per second) for modern hardware
-        scenarios = {
-            'Single CPU (Basic)': 1e5,           # 100K guesses/sec
-            'Single CPU (Optimized)': 1e7,       # 10M guesses/sec  
-            'Single GPU (RTX 4090)': 1e11,       # 100B guesses/sec
-            'GPU Cluster (10 GPUs)': 1e12,       # 1T guesses/sec
-            'GPU Cluster (100 GPUs)': 1e13,      # 10T guesses/sec
-            'Massive GPU Array (1K GPUs)': 1e14, # 100T guesses/sec
-            'Massive GPU Array (10K GPUs)': 1e15, # 1P guesses/sec
-            'Massive GPU Array (100K GPUs)': 1e16, # 10P guesses/sec
-        }
-        
         estimates = {}
-        for scenario, guesses_per_sec in scenarios.items():
+        for scenario, guesses_per_sec in self.ATTACK_SCENARIOS.items():
             seconds = base_guesses / (2 * guesses_per_sec)  # Average case
             estimates[scenario] = self._format_time(seconds)
         
         return estimates
     
+    def _format_log_time(self, log10_seconds):
+        """Format a time given as log10(seconds), for values beyond float range"""
+        if log10_seconds < 300:
+            return self._format_time(10 ** log10_seconds)
+        log10_millennia = log10_seconds - math.log10(31556952000)
+        exponent = int(log10_millennia)
+        mantissa = 10 ** (log10_millennia - exponent)
+        return f"{mantissa:.1f} × 10^{exponent} millennia"
+    
     def _format_time(self, seconds):
         """Format time in human readable format with millennia as the maximum unit"""
         if seconds < 1:
@@ -380,13 +2732,503 @@ class PasswordAnalyzer:
                     return "∞ millennia"
 
 
+class PregenerationPool:
+    """Bounded pool of ready-made passwords and analyses, filled by a background thread
+    
+    Entries are only valid for the option set they were made for; changing
+    the options wipes them. Passwords are held as bytearrays so they can be
+    zeroed when discarded (strings handed out to callers cannot be).
+    """
+    
+    def __init__(self, generator, analyzer, capacity=3):
+        self.generator = generator
+        self.analyzer = analyzer
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._condition = threading.Condition()
+        self._entries = deque()
+        self._options = None
+        self._epoch = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._fill, name="pregeneration-pool", daemon=True)
+        self._thread.start()
+    
+    def set_options(self, options):
+        """Switch to a new option tuple (length, lower, upper, digits, symbols)"""
+        with self._condition:
+            if options == self._options:
+                return
+            self._wipe_entries()
+            self._options = options
+            self._epoch += 1
+            self._condition.notify_all()
+    
+    def take(self, options):
+        """Return (password, analysis) made for these options, or None on a miss"""
+        with self._condition:
+            if options != self._options or not self._entries:
+                self.misses += 1
+                return None
+            buffer, analysis = self._entries.popleft()
+            self.hits += 1
+            self._condition.notify_all()
+        password = buffer.decode('utf-8')
+        buffer[:] = bytes(len(buffer))
+        return password, analysis
+    
+    def stats(self):
+        with self._condition:
+            return {'hits': self.hits, 'misses': self.misses, 'ready': len(self._entries)}
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._wipe_entries()
+            self._condition.notify_all()
+    
+    def _wipe_entries(self):
+        while self._entries:
+            buffer, analysis = self._entries.popleft()
+            buffer[:] = bytes(len(buffer))
+            analysis.clear()
+    
+    def _fill(self):
+        while True:
+            with self._condition:
+                while not self._closed and (self._options is None or len(self._entries) >= self.capacity):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                options, epoch = self._options, self._epoch
+            
+            try:
+                password = self.generator.generate(*options)
+                analysis = self.analyzer.analyze(password, self.generator.generation_info(*options))
+            except Exception:
+                # Leave this option set to the synchronous path
+                with self._condition:
+                    if epoch == self._epoch:
+                        self._options = None
+                continue
+            
+            buffer = bytearray(password.encode('utf-8'))
+            with self._condition:
+                if epoch == self._epoch and not self._closed and len(self._entries) < self.capacity:
+                    self._entries.append((buffer, analysis))
+                else:
+                    buffer[:] = bytes(len(buffer))
+                    analysis.clear()
+
+
+class AnalysisWorker:
+    """Background thread running one analysis at a time, keeping only the newest request
+    
+    Each submit() bumps a generation counter and replaces any request that
+    has not started. An analysis already running cannot be interrupted, so
+    its result is simply not delivered once a newer request exists.
+    """
+    
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self._condition = threading.Condition()
+        self._request = None
+        self._generation = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="analysis-worker", daemon=True)
+        self._thread.start()
+    
+    def submit(self, password, callback, info=None, analyzer=None):
+        """Analyze password in the background; callback(generation, result) runs on the worker thread"""
+        with self._condition:
+            self._generation += 1
+            self._request = (self._generation, password, info, callback, analyzer or self.analyzer)
+            self._condition.notify_all()
+            return self._generation
+    
+    def cancel(self):
+        """Drop the pending request and any result still in flight"""
+        with self._condition:
+            self._generation += 1
+            self._request = None
+    
+    def is_current(self, generation):
+        return generation == self._generation
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._request = None
+            self._condition.notify_all()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and self._request is None:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation, password, info, callback, analyzer = self._request
+                self._request = None
+            
+            try:
+                result = analyzer.analyze(password, info)
+            except Exception:
+                continue
+            finally:
+                password = None
+            if self.is_current(generation):
+                callback(generation, result)
+
+
+class BatchTab:
+    """Batch page: N passwords in a TreeView, scored in the background, visible rows first
+    
+    Rows are appended in idle-time chunks and the view uses fixed-height mode,
+    so GTK only measures the rows on screen. A worker thread runs zxcvbn on
+    the rows in view first and then sweeps the rest; finished scores are
+    written to the model in batches from the main loop.
+    """
+    
+    # ListStore columns
+    COL_INDEX, COL_PASSWORD, COL_SCORE, COL_SCORE_TEXT, COL_GUESSES, COL_CRACK_TIME, COL_BREACHED = range(7)
+    # Row states in _analyzed: claimed by the worker, then done once written to the model
+    ROW_PENDING, ROW_CLAIMED, ROW_DONE, ROW_FAILED = range(4)
+    # Rows appended per idle callback while filling
+    FILL_CHUNK = 5000
+    # Scenario shown in the crack time column
+    CRACK_TIME_SCENARIO = 'Single GPU (RTX 4090)'
+    
+    def __init__(self, generator, analyzer, get_options, window):
+        self.generator = generator
+        self.analyzer = analyzer
+        self.get_options = get_options
+        self.window = window
+        
+        self.passwords = []
+        self.iters = []
+        self.generation_text = ""
+        self.fill_source = None
+        self.visible_timeout = None
+        
+        self._condition = threading.Condition()
+        self._filling = False
+        self._epoch = 0
+        self._visible = []
+        self._sweep = 0
+        self._analyzed = bytearray()
+        self._results = []
+        self._flush_pending = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="batch-analysis", daemon=True)
+        self._thread.start()
+        
+        self.setup_ui()
+    
+    def setup_ui(self):
+        self.widget = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        self.widget.set_margin_top(10)
+        
+        controls = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        count_label = Gtk.Label(label="Passwords:")
+        self.count_spinbutton = Gtk.SpinButton.new_with_range(1, 1000000, 100)
+        self.count_spinbutton.set_value(1000)
+        
+        generate_button = Gtk.Button(label="Generate Batch")
+        generate_button.connect("clicked", self.on_generate_clicked)
+        self.copy_button = Gtk.Button(label="Copy Selected")
+        self.copy_button.connect("clicked", self.on_copy_clicked)
+        self.copy_button.set_sensitive(False)
+        self.export_button = Gtk.Button(label="Export Selected…")
+        self.export_button.connect("clicked", self.on_export_clicked)
+        self.export_button.set_sensitive(False)
+        
+        controls.pack_start(count_label, False, False, 0)
+        controls.pack_start(self.count_spinbutton, False, False, 0)
+        controls.pack_start(generate_button, False, False, 0)
+        controls.pack_end(self.export_button, False, False, 0)
+        controls.pack_end(self.copy_button, False, False, 0)
+        self.widget.pack_start(controls, False, False, 0)
+        
+        # Score and guesses -1 mean "not analyzed yet" and sort first
+        self.store = Gtk.ListStore(int, str, int, str, float, str, str)
+        self.treeview = Gtk.TreeView(model=self.store)
+        self.treeview.get_selection().set_mode(Gtk.SelectionMode.MULTIPLE)
+        self.treeview.get_selection().connect("changed", self.on_selection_changed)
+        
+        columns = [("#", self.COL_INDEX, self.COL_INDEX, 70, False),
+                   ("Password", self.COL_PASSWORD, None, 320, True),
+                   ("Score", self.COL_SCORE_TEXT, self.COL_SCORE, 110, False),
+                   ("log10 Guesses", self.COL_GUESSES, self.COL_GUESSES, 110, False),
+                   ("GPU Crack Time", self.COL_CRACK_TIME, None, 160, False)]
+        if self.analyzer.breach_corpus is not None:
+            columns.append(("Breached", self.COL_BREACHED, self.COL_BREACHED, 90, False))
+        for title, column_id, sort_id, width, monospace in columns:
+            renderer = Gtk.CellRendererText()
+            if monospace:
+                renderer.set_property("family", "monospace")
+            if column_id == self.COL_GUESSES:
+                # Stored as a float so it sorts numerically; formatted for display
+                column = Gtk.TreeViewColumn(title, renderer)
+                column.set_cell_data_func(renderer, self.render_guesses)
+            else:
+                column = Gtk.TreeViewColumn(title, renderer, text=column_id)
+            # Fixed sizing is required for fixed-height mode
+            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+            column.set_fixed_width(width)
+            column.set_resizable(True)
+            if sort_id is not None:
+                column.set_sort_column_id(sort_id)
+            self.treeview.append_column(column)
+        self.treeview.set_fixed_height_mode(True)
+        
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        scroll.add(self.treeview)
+        scroll.get_vadjustment().connect("value-changed", self.on_view_moved)
+        self.treeview.connect("size-allocate", self.on_view_moved)
+        self.widget.pack_start(scroll, True, True, 0)
+        
+        self.status_label = Gtk.Label()
+        self.status_label.set_xalign(0)
+        self.widget.pack_start(self.status_label, False, False, 0)
+    
+    def render_guesses(self, column, renderer, model, tree_iter, data=None):
+        guesses = model[tree_iter][self.COL_GUESSES]
+        renderer.set_property("text", f"{guesses:.1f}" if guesses >= 0 else "")
+    
+    def on_generate_clicked(self, button):
+        """Generate a new batch, replacing the current one"""
+        options = self.get_options()
+        count = int(self.count_spinbutton.get_value())
+        try:
+            batch = self.generator.generate_batch(count, *options)
+            info = self.generator.generation_info(*options)
+        except ValueError as e:
+            self.status_label.set_text(f"Error: {e}")
+            return
+        
+        if self.fill_source:
+            GLib.source_remove(self.fill_source)
+        with self._condition:
+            self._epoch += 1
+            self._filling = True
+            self._visible = []
+            self._sweep = 0
+            self._analyzed = bytearray(count)
+            self._results = []
+            # A flush still pending for the old batch will not deliver this one's results
+            self._flush_pending = False
+            self.passwords = list(batch)
+            self.iters = []
+        batch.wipe()
+        
+        # Clearing a detached store skips a row-deleted signal per row, and
+        # sorting a store that is being filled would re-sort on every append
+        self.treeview.set_model(None)
+        self.store.clear()
+        self.store.set_sort_column_id(Gtk.TREE_SORTABLE_UNSORTED_SORT_COLUMN_ID, Gtk.SortType.ASCENDING)
+        self.treeview.set_model(self.store)
+        self.generation_text = (f"generator search space 10^{info.log10_space:.1f} per password "
+                                f"(score {self.analyzer._score_from_log10(info.log10_space)}/4)")
+        self.fill_source = GLib.idle_add(self.fill_rows, self._epoch)
+    
+    def fill_rows(self, epoch):
+        """Idle callback appending the next FILL_CHUNK rows"""
+        if epoch != self._epoch:
+            return False
+        start = len(self.iters)
+        append = self.store.append
+        for index in range(start, min(start + self.FILL_CHUNK, len(self.passwords))):
+            self.iters.append(append((index + 1, self.passwords[index], -1, "…", -1.0, "", "")))
+        self.update_status()
+        if len(self.iters) < len(self.passwords):
+            return True
+        self.fill_source = None
+        with self._condition:
+            self._filling = False
+            self._condition.notify_all()
+        self.on_view_moved()
+        return False
+    
+    def on_view_moved(self, *args):
+        """Debounce scrolling, then move the rows in view to the front of the analysis queue"""
+        if self.visible_timeout:
+            GLib.source_remove(self.visible_timeout)
+        self.visible_timeout = GLib.timeout_add(100, self.queue_visible_rows)
+    
+    def queue_visible_rows(self):
+        self.visible_timeout = None
+        visible = self.treeview.get_visible_range()
+        if not visible:
+            return False
+        start, end = visible
+        first, last = start.get_indices()[0], end.get_indices()[0]
+        rows = [self.store[path][self.COL_INDEX] - 1 for path in range(first, min(last + 1, len(self.store)))]
+        with self._condition:
+            self._visible = [index for index in rows if not self._analyzed[index]]
+            self._condition.notify_all()
+        return False
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._next_index():
+                    self._condition.wait()
+                if self._closed:
+                    return
+                index = self._next_index()
+                self._analyzed[index - 1] = self.ROW_CLAIMED
+                epoch, password = self._epoch, self.passwords[index - 1]
+            
+            try:
+                result = self.analyzer.analyze(password, max_patterns=0)
+            except Exception:
+                result = None  # shown as failed rather than left blank
+            
+            with self._condition:
+                if epoch != self._epoch:
+                    continue
+                self._results.append((index - 1, result))
+                if not self._flush_pending:
+                    self._flush_pending = True
+                    GLib.timeout_add(50, self.flush_results, epoch)
+    
+    def _next_index(self):
+        """1-based index of the next row to analyze, 0 if none (called with the lock held)"""
+        # Rows are only analyzed once the store is complete
+        if self._filling:
+            return 0
+        while self._visible:
+            index = self._visible[0]
+            if not self._analyzed[index]:
+                return index + 1
+            self._visible.pop(0)
+        while self._sweep < len(self.passwords):
+            if not self._analyzed[self._sweep]:
+                return self._sweep + 1
+            self._sweep += 1
+        return 0
+    
+    def flush_results(self, epoch):
+        """Write finished analyses into the model, at most every 50 ms"""
+        with self._condition:
+            if epoch != self._epoch:
+                return False  # the current batch owns _results and schedules its own flush
+            results, self._results = self._results, []
+            self._flush_pending = False
+            for index, result in results:
+                self._analyzed[index] = self.ROW_DONE if result is not None else self.ROW_FAILED
+        
+        score_labels = ['Very Weak', 'Weak', 'Fair', 'Good', 'Strong']
+        for index, result in results:
+            if result is None:
+                self.store.set(self.iters[index], (self.COL_SCORE_TEXT,), ("Failed",))
+                continue
+            guesses = result.guesses_log10 if result.guesses_log10 is not None else -1.0
+            crack_time = self.analyzer.get_crack_time_estimates(result).get(self.CRACK_TIME_SCENARIO, "")
+            breached = "" if result.breached is None else f"Yes ({result.breached:,})" if result.breached else "No"
+            self.store.set(self.iters[index],
+                           (self.COL_SCORE, self.COL_SCORE_TEXT, self.COL_GUESSES, self.COL_CRACK_TIME,
+                            self.COL_BREACHED),
+                           (result.score, f"{result.score}/4 {score_labels[result.score]}",
+                            guesses, crack_time, breached))
+        self.update_status()
+        return False
+    
+    def update_status(self):
+        with self._condition:
+            analyzed = self._analyzed.count(self.ROW_DONE)
+            failed = self._analyzed.count(self.ROW_FAILED)
+        failures = f" ({failed:,} failed)" if failed else ""
+        self.status_label.set_text(f"{len(self.iters):,} of {len(self.passwords):,} rows, "
+                                   f"{analyzed:,} analyzed with zxcvbn{failures}; {self.generation_text}")
+    
+    def selected_rows(self):
+        model, paths = self.treeview.get_selection().get_selected_rows()
+        return [model[path] for path in paths]
+    
+    def on_selection_changed(self, selection):
+        selected = selection.count_selected_rows() > 0
+        self.copy_button.set_sensitive(selected)
+        self.export_button.set_sensitive(selected)
+    
+    def on_copy_clicked(self, button):
+        """Copy the selected passwords, one per line"""
+        passwords = [row[self.COL_PASSWORD] for row in self.selected_rows()]
+        if passwords:
+            clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
+            clipboard.set_text("\n".join(passwords), -1)
+    
+    def on_export_clicked(self, button):
+        """Save the selected rows as CSV"""
+        dialog = Gtk.FileChooserDialog(title="Export Selected Passwords", parent=self.window,
+                                       action=Gtk.FileChooserAction.SAVE)
+        dialog.add_buttons("_Cancel", Gtk.ResponseType.CANCEL, "_Save", Gtk.ResponseType.OK)
+        dialog.set_do_overwrite_confirmation(True)
+        dialog.set_current_name("passwords.csv")
+        response = dialog.run()
+        path = dialog.get_filename()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or not path:
+            return
+        
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                breach_check = self.analyzer.breach_corpus is not None
+                writer.writerow(('password', 'score', 'guesses_log10') + (('breached',) if breach_check else ()))
+                for row in self.selected_rows():
+                    score, guesses = row[self.COL_SCORE], row[self.COL_GUESSES]
+                    fields = (row[self.COL_PASSWORD], score if score >= 0 else "",
+                              f"{guesses:.1f}" if guesses >= 0 else "")
+                    if breach_check:
+                        fields += (row[self.COL_BREACHED],)
+                    writer.writerow(fields)
+        except OSError as e:
+            self.status_label.set_text(f"Error: {e}")
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._epoch += 1
+            self.passwords = []
+            self._condition.notify_all()
+
+
 class SecretSauceGUI:
     """Main GTK3 GUI application for SecretSauce"""
     
-    def __init__(self):
+    # Pause in typing before a checked password is re-analyzed
+    CHECK_DEBOUNCE_MS = 150
+    # Longest typed password scored exactly: zxcvbn refuses anything longer
+    CHECK_EXACT_LENGTH = 72
+    
+    def __init__(self, pool_size=3, highlight_stride=8, highlight_style=None, dictionaries=(), breach_corpus=None):
         self.generator = PasswordGenerator()
-        self.analyzer = PasswordAnalyzer()
+        # Every highlight_stride-th character of the password is drawn with highlight_style
+        # (TextTag properties); a stride of 0 turns highlighting off
+        self.highlight_stride = highlight_stride
+        self.highlight_style = highlight_style
+        # Re-checks of the same password are served from the cache
+        # Both analyzers share the memory-mapped organization dictionaries and breach corpus
+        dictionaries = [RankedIndex(path) for path in dictionaries]
+        if breach_corpus is not None:
+            breach_corpus = BreachCorpus(breach_corpus)
+        self.analyzer = PasswordAnalyzer(cache=AnalysisCache(256, ttl=3600), dictionaries=dictionaries,
+                                         breach_corpus=breach_corpus)
         self.current_password = ""
+        # Optional background pool so Generate only swaps in finished results
+        self.pool = PregenerationPool(self.generator, self.analyzer, pool_size) if pool_size > 0 else None
+        # zxcvbn runs here, off the main loop
+        self.analysis_worker = AnalysisWorker(self.analyzer)
+        # Typed passwords: exact zxcvbn up to its own 72-character maximum
+        # (30-60 ms in the worker), cached 16-character windows beyond, so
+        # each keystroke past it re-analyzes only the windows it changed
+        self.check_analyzer = PasswordAnalyzer(exact_length=self.CHECK_EXACT_LENGTH, time_budget=0.012,
+                                               cache=AnalysisCache(1024, ttl=600), dictionaries=dictionaries,
+                                               breach_corpus=breach_corpus)
+        self.check_timeout = None
         
         self.setup_ui()
     
@@ -396,7 +3238,7 @@ class SecretSauceGUI:
         self.window = Gtk.Window()
         self.window.set_title("SecretSauce - Password Generator & Validator")
         self.window.set_default_size(600, 650)
-        self.window.connect("destroy", Gtk.main_quit)
+        self.window.connect("destroy", self.on_destroy)
         
         # Main container
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
@@ -467,6 +3309,11 @@ class SecretSauceGUI:
         self.length_spinbutton.set_increments(1, 8)
         length_box.pack_start(self.length_spinbutton, False, False, 0)
         
+        # Any option change invalidates pre-generated passwords
+        for check in (self.lowercase_check, self.uppercase_check, self.digits_check, self.symbols_check):
+            check.connect("toggled", self.on_options_changed)
+        self.length_spinbutton.connect("value-changed", self.on_options_changed)
+        
         length_section.pack_start(length_box, False, False, 0)
         
         # Pack sections side by side
@@ -476,6 +3323,11 @@ class SecretSauceGUI:
         options_frame.add(options_main_box)
         main_box.pack_start(options_frame, False, False, 0)
         
+        # Single password and batch pages share the options above
+        notebook = Gtk.Notebook()
+        single_page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
+        single_page.set_margin_top(10)
+        
         # Generate and Copy buttons (removed scan button)
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10, homogeneous=True)
         
@@ -486,10 +3338,15 @@ class SecretSauceGUI:
         self.copy_button.connect("clicked", self.on_copy_clicked)
         self.copy_button.set_sensitive(False)
         
+        self.check_button = Gtk.ToggleButton(label="Check My Password")
+        self.check_button.set_tooltip_text("Type or paste a password to analyze it as you type")
+        self.check_button.connect("toggled", self.on_check_toggled)
+        
         button_box.pack_start(self.generate_button, True, True, 0)
         button_box.pack_start(self.copy_button, True, True, 0)
+        button_box.pack_start(self.check_button, True, True, 0)
         
-        main_box.pack_start(button_box, False, False, 0)
+        single_page.pack_start(button_box, False, False, 0)
         
         # Password display
         password_frame = Gtk.Frame(label="Generated Password")
@@ -525,13 +3382,17 @@ class SecretSauceGUI:
         # Set up text buffer for highlighting
         self.password_buffer = self.password_textview.get_buffer()
         self.highlight_tag = self.password_buffer.create_tag("highlight")
-        self.highlight_tag.set_property("foreground", "#dc3545")  # Red text color
-        self.highlight_tag.set_property("weight", Pango.Weight.BOLD)
+        if self.highlight_style is None:
+            self.highlight_style = {"foreground": "#dc3545",  # Red text color
+                                    "weight": Pango.Weight.BOLD}
+        for name, value in self.highlight_style.items():
+            self.highlight_tag.set_property(name, value)
+        self.password_buffer.connect("changed", self.on_password_edited)
         
         password_container.pack_start(self.password_textview, False, False, 0)
         
         password_frame.add(password_container)
-        main_box.pack_start(password_frame, False, False, 0)
+        single_page.pack_start(password_frame, False, False, 0)
         
         # Security Analysis
         analysis_frame = Gtk.Frame(label="Security Analysis (zxcvbn)")
@@ -547,7 +3408,7 @@ class SecretSauceGUI:
         
         analysis_scroll.add(self.analysis_box)
         analysis_frame.add(analysis_scroll)
-        main_box.pack_start(analysis_frame, True, True, 0)
+        single_page.pack_start(analysis_frame, True, True, 0)
         
         # Crack Time Estimates
         crack_time_frame = Gtk.Frame(label="Crack Time Estimates")
@@ -563,13 +3424,42 @@ class SecretSauceGUI:
         
         crack_time_scroll.add(self.crack_time_box)
         crack_time_frame.add(crack_time_scroll)
-        main_box.pack_start(crack_time_frame, True, True, 0)
+        single_page.pack_start(crack_time_frame, True, True, 0)
+        self.setup_analysis_widgets()
+        
+        self.batch_tab = BatchTab(self.generator, self.analyzer, self.get_options, self.window)
+        notebook.append_page(single_page, Gtk.Label(label="Password"))
+        notebook.append_page(self.batch_tab.widget, Gtk.Label(label="Batch"))
+        main_box.pack_start(notebook, True, True, 0)
         
         self.window.add(main_box)
         self.window.show_all()
         
         # Auto-generate a password when the application starts
         self.on_generate_clicked(None)
+        self.on_options_changed(None)
+    
+    def get_options(self):
+        """Current generation options as (length, lower, upper, digits, symbols)"""
+        return (int(self.length_spinbutton.get_value()),
+                self.lowercase_check.get_active(),
+                self.uppercase_check.get_active(),
+                self.digits_check.get_active(),
+                self.symbols_check.get_active())
+    
+    def on_options_changed(self, widget):
+        """Re-target the pre-generation pool at the new option set"""
+        if self.pool:
+            self.pool.set_options(self.get_options())
+    
+    def on_destroy(self, window):
+        if self.check_timeout:
+            GLib.source_remove(self.check_timeout)
+        if self.pool:
+            self.pool.close()
+        self.analysis_worker.close()
+        self.batch_tab.close()
+        Gtk.main_quit()
     
     def on_about_clicked(self, button):
         """Show about dialog"""
@@ -579,53 +3469,206 @@ class SecretSauceGUI:
     
     def on_generate_clicked(self, button):
         """Handle generate button click"""
-        length = int(self.length_spinbutton.get_value())
-        use_lower = self.lowercase_check.get_active()
-        use_upper = self.uppercase_check.get_active()
-        use_digits = self.digits_check.get_active()
-        use_symbols = self.symbols_check.get_active()
-        
-        self.current_password = self.generator.generate(
-            length, use_lower, use_upper, use_digits, use_symbols
-        )
+        if self.check_button.get_active():
+            self.check_button.set_active(False)
+        options = self.get_options()
         
-        self.display_password()
-        self.analyze_password()
+        ready = self.pool.take(options) if self.pool else None
+        if ready:
+            self.current_password, analysis = ready
+            self.analysis_worker.cancel()
+            self.display_password()
+            self.display_analysis(analysis)
+        else:
+            self.current_password = self.generator.generate(*options)
+            self.display_password()
+            self.analyze_password(self.generator.generation_info(*options))
+        
+        if self.pool:
+            stats = self.pool.stats()
+            self.generate_button.set_tooltip_text(
+                f"Pre-generated: {stats['hits']} hits, {stats['misses']} misses, {stats['ready']} ready")
         self.copy_button.set_sensitive(True)
     
-    def display_password(self):
-        """Display password with highlighting every 8th character"""
-        self.password_buffer.set_text("")
+    def on_check_toggled(self, button):
+        """Switch the password view between generated output and typed input"""
+        checking = button.get_active()
+        self.password_textview.set_editable(checking)
+        self.password_textview.set_cursor_visible(checking)
+        if self.check_timeout:
+            GLib.source_remove(self.check_timeout)
+            self.check_timeout = None
         
+        if checking:
+            self.analysis_worker.cancel()
+            self.current_password = ""
+            self.password_buffer.set_text("")
+            self.display_analysis(None)
+            self.copy_button.set_sensitive(False)
+            self.password_textview.grab_focus()
+        else:
+            self.display_password()
+    
+    def on_password_edited(self, buffer):
+        """Debounce typing: analyze once input pauses for CHECK_DEBOUNCE_MS"""
+        if not self.check_button.get_active():
+            return
+        if self.check_timeout:
+            GLib.source_remove(self.check_timeout)
+        self.check_timeout = GLib.timeout_add(self.CHECK_DEBOUNCE_MS, self.on_check_timeout)
+    
+    def on_check_timeout(self):
+        self.check_timeout = None
+        self.current_password = self.password_buffer.get_text(
+            self.password_buffer.get_start_iter(), self.password_buffer.get_end_iter(), False)
+        self.copy_button.set_sensitive(bool(self.current_password))
         if not self.current_password:
+            self.analysis_worker.cancel()
+            self.display_analysis(None)
+        else:
+            # Previous results stay up until the new ones arrive, avoiding flicker
+            self.analysis_worker.submit(self.current_password, self.on_analysis_finished,
+                                        analyzer=self.check_analyzer)
+        return False
+    
+    def display_password(self):
+        """Display password with highlighting every highlight_stride-th character"""
+        # One bulk insert, then the tag over each highlighted range: a few
+        # hundred cheap calls for a 4096-character password instead of one
+        # insert (and re-layout) per character
+        self.password_buffer.set_text(self.current_password)
+        
+        stride = self.highlight_stride
+        if not self.current_password or stride <= 0:
             return
         
-        # Insert text with highlighting
-        for i, char in enumerate(self.current_password):
-            iter_pos = self.password_buffer.get_end_iter()
-            if (i + 1) % 8 == 0:  # Every 8th character
-                self.password_buffer.insert_with_tags(iter_pos, char, self.highlight_tag)
-            else:
-                self.password_buffer.insert(iter_pos, char)
+        # With stride 1 the ranges merge into a single one
+        width = 1 if stride > 1 else len(self.current_password)
+        for start in range(stride - 1, len(self.current_password), max(stride, width)):
+            self.password_buffer.apply_tag(self.highlight_tag,
+                                           self.password_buffer.get_iter_at_offset(start),
+                                           self.password_buffer.get_iter_at_offset(start + width))
     
-    def analyze_password(self):
+    def analyze_password(self, info=None):
         """Analyze current password and display results"""
         if not self.current_password:
             return
         
-        analysis = self.analyzer.analyze_password(self.current_password)
-        self.display_analysis(analysis)
+        # Closed-form analysis is O(1); anything that runs zxcvbn goes to the worker
+        if info is not None and not self.analyzer.cross_check:
+            self.analysis_worker.cancel()
+            self.display_analysis(self.analyzer.analyze(self.current_password, info))
+            return
+        
+        self.display_analyzing()
+        self.analysis_worker.submit(self.current_password, self.on_analysis_finished, info)
+    
+    def on_analysis_finished(self, generation, analysis):
+        """Worker thread callback: hand the result to the main loop"""
+        GLib.idle_add(self.show_analysis_result, generation, analysis)
+    
+    def show_analysis_result(self, generation, analysis):
+        # Results for a password that has since been replaced are dropped
+        if self.analysis_worker.is_current(generation):
+            self.display_analysis(analysis)
+        return False
+    
+    def setup_analysis_widgets(self):
+        """Create the analysis and crack time rows once; display_analysis only updates them"""
+        def row_label(margin=0, wrap=True):
+            label = Gtk.Label()
+            label.set_xalign(0)
+            label.set_line_wrap(wrap)
+            label.set_margin_start(margin)
+            label.set_no_show_all(True)
+            self.analysis_box.pack_start(label, False, False, 0)
+            return label
+        
+        # Markup currently shown by each label, so unchanged rows are left alone
+        self.shown_markup = {}
+        
+        self.busy_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        self.busy_spinner = Gtk.Spinner()
+        busy_label = Gtk.Label(label="Analyzing\u2026")
+        self.busy_box.pack_start(self.busy_spinner, False, False, 0)
+        self.busy_box.pack_start(busy_label, False, False, 0)
+        self.busy_box.set_no_show_all(True)
+        self.busy_spinner.show()
+        busy_label.show()
+        self.analysis_box.pack_start(self.busy_box, False, False, 0)
+        
+        self.score_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        score_label = Gtk.Label()
+        score_label.set_markup('<span size="large"><b>Password Strength: </b></span>')
+        self.score_value = Gtk.Label()
+        self.score_box.pack_start(score_label, False, False, 0)
+        self.score_box.pack_start(self.score_value, False, False, 0)
+        self.score_box.set_no_show_all(True)
+        score_label.show()
+        self.score_value.show()
+        self.analysis_box.pack_start(self.score_box, False, False, 0)
+        
+        self.guesses_label = row_label(wrap=False)
+        self.breach_label = row_label(wrap=False)
+        self.generation_label = row_label()
+        self.approximation_label = row_label()
+        self.warning_label = row_label()
+        self.suggestions_header = row_label(wrap=False)
+        self.suggestions_header.set_markup('<b>Suggestions:</b>')
+        # zxcvbn gives at most a handful of suggestions; more rows are added if needed
+        self.suggestion_labels = [row_label(margin=20) for _ in range(3)]
+        self.sequence_header = row_label(wrap=False)
+        self.sequence_header.set_markup('<b>Pattern Analysis:</b>')
+        self.pattern_labels = [row_label(margin=20) for _ in range(5)]  # Show first 5 patterns
+        
+        self.crack_time_labels = {}
+        for scenario in self.analyzer.ATTACK_SCENARIOS:
+            time_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+            
+            scenario_label = Gtk.Label()
+            scenario_label.set_markup(f'<b>{scenario}:</b>')
+            scenario_label.set_size_request(250, -1)
+            scenario_label.set_xalign(0)
+            
+            time_label = Gtk.Label()
+            time_label.set_xalign(0)
+            
+            time_box.pack_start(scenario_label, False, False, 0)
+            time_box.pack_start(time_label, True, True, 0)
+            time_box.set_no_show_all(True)
+            scenario_label.show()
+            time_label.show()
+            
+            self.crack_time_box.pack_start(time_box, False, False, 0)
+            self.crack_time_labels[scenario] = (time_box, time_label)
+    
+    def set_row(self, widget, markup=None, visible=True):
+        """Show or hide a row, touching its label only when the markup changed"""
+        if markup is not None and self.shown_markup.get(widget) != markup:
+            widget.set_markup(markup)
+            self.shown_markup[widget] = markup
+        if widget.get_visible() != visible:
+            widget.set_visible(visible)
+    
+    def display_analyzing(self):
+        """Placeholder shown while the worker is busy"""
+        self.display_analysis(None)
+        self.busy_spinner.start()
+        self.busy_box.show()
     
     def display_analysis(self, analysis):
         """Display zxcvbn analysis results"""
-        # Clear previous results
-        for child in self.analysis_box.get_children():
-            self.analysis_box.remove(child)
-        
-        for child in self.crack_time_box.get_children():
-            self.crack_time_box.remove(child)
+        if self.busy_box.get_visible():
+            self.busy_spinner.stop()
+            self.busy_box.hide()
         
         if not analysis:
+            for widget in (self.score_box, self.guesses_label, self.breach_label, self.generation_label,
+                           self.approximation_label, self.warning_label, self.suggestions_header, self.sequence_header,
+                           *self.suggestion_labels, *self.pattern_labels):
+                self.set_row(widget, visible=False)
+            for time_box, time_label in self.crack_time_labels.values():
+                self.set_row(time_box, visible=False)
             return
         
         # Score display
@@ -633,19 +3676,19 @@ class SecretSauceGUI:
         score_colors = ['red', 'orange', 'orange', 'blue', 'green']
         score_labels = ['Very Weak', 'Weak', 'Fair', 'Good', 'Strong']
         
-        score_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        score_label = Gtk.Label()
-        score_label.set_markup(f'<span size="large"><b>Password Strength: </b></span>')
-        score_value = Gtk.Label()
-        score_value.set_markup(f'<span size="large" color="{score_colors[score]}"><b>{score}/4 - {score_labels[score]}</b></span>')
-        
-        score_box.pack_start(score_label, False, False, 0)
-        score_box.pack_start(score_value, False, False, 0)
-        self.analysis_box.pack_start(score_box, False, False, 0)
+        # Bounded analysis only gives a lower bound; say so next to the numbers
+        approx = "≈ " if analysis.get('approximate') else ""
+        self.set_row(self.score_value,
+                     f'<span size="large" color="{score_colors[score]}"><b>{approx}{score}/4 - {score_labels[score]}'
+                     f'</b></span>')
+        self.set_row(self.score_box)
         
         # Guesses - format with scientific notation for large numbers
         guesses = analysis.get('guesses', 0)
-        if guesses > 0:
+        if analysis.get('guesses_log10', 0) >= 300:
+            exponent = int(analysis['guesses_log10'])
+            guesses_text = f"{10 ** (analysis['guesses_log10'] - exponent):.1f} × 10^{exponent}"
+        elif guesses > 0:
             try:
                 guesses_float = float(guesses)
                 if guesses_float >= 1e6:  # Use scientific notation for numbers >= 1 million
@@ -659,10 +3702,28 @@ class SecretSauceGUI:
         else:
             guesses_text = "0"
         
-        guesses_label = Gtk.Label()
-        guesses_label.set_markup(f'<b>Estimated Guesses:</b> {guesses_text}')
-        guesses_label.set_xalign(0)
-        self.analysis_box.pack_start(guesses_label, False, False, 0)
+        self.set_row(self.guesses_label, f'<b>Estimated Guesses:</b> {approx}{guesses_text}')
+        
+        breached = analysis.get('breached')
+        if breached is None:
+            self.set_row(self.breach_label, visible=False)
+        elif breached:
+            self.set_row(self.breach_label, f'<b>Breach Check:</b> <span color="red"><b>found {breached:,} '
+                                            f'time{"s" if breached != 1 else ""} in breached password lists</b></span>')
+        else:
+            self.set_row(self.breach_label, f'<b>Breach Check:</b> <span color="green">not found among '
+                                            f'{len(self.analyzer.breach_corpus):,} breached passwords</span>')
+        
+        if analysis.get('analytic'):
+            self.set_row(self.generation_label,
+                         f'<i>Exact search space of the generator ({GLib.markup_escape_text(analysis["generation"])})</i>')
+        else:
+            self.set_row(self.generation_label, visible=False)
+        
+        if analysis.get('approximate'):
+            self.set_row(self.approximation_label, f'<i>{GLib.markup_escape_text(analysis["approximation"])}</i>')
+        else:
+            self.set_row(self.approximation_label, visible=False)
         
         # Feedback
         feedback = analysis.get('feedback', {})
@@ -670,69 +3731,50 @@ class SecretSauceGUI:
         suggestions = feedback.get('suggestions', [])
         
         if warning:
-            warning_label = Gtk.Label()
-            warning_label.set_markup(f'<span color="red"><b>Warning:</b> {warning}</span>')
-            warning_label.set_xalign(0)
-            warning_label.set_line_wrap(True)
-            self.analysis_box.pack_start(warning_label, False, False, 0)
-        
-        if suggestions:
-            suggestions_label = Gtk.Label()
-            suggestions_label.set_markup('<b>Suggestions:</b>')
-            suggestions_label.set_xalign(0)
-            self.analysis_box.pack_start(suggestions_label, False, False, 0)
-            
-            for suggestion in suggestions:
-                suggestion_label = Gtk.Label()
-                suggestion_label.set_markup(f'• {suggestion}')
-                suggestion_label.set_xalign(0)
-                suggestion_label.set_line_wrap(True)
-                suggestion_label.set_margin_start(20)
-                self.analysis_box.pack_start(suggestion_label, False, False, 0)
+            self.set_row(self.warning_label, f'<span color="red"><b>Warning:</b> {warning}</span>')
+        else:
+            self.set_row(self.warning_label, visible=False)
+        
+        self.set_row(self.suggestions_header, visible=bool(suggestions))
+        while len(self.suggestion_labels) < len(suggestions):
+            label = Gtk.Label()
+            label.set_xalign(0)
+            label.set_line_wrap(True)
+            label.set_margin_start(20)
+            label.set_no_show_all(True)
+            self.analysis_box.pack_start(label, False, False, 0)
+            self.analysis_box.reorder_child(label, self.analysis_box.get_children().index(self.suggestion_labels[-1]) + 1)
+            self.suggestion_labels.append(label)
+        for i, label in enumerate(self.suggestion_labels):
+            if i < len(suggestions):
+                self.set_row(label, f'• {suggestions[i]}')
+            else:
+                self.set_row(label, visible=False)
         
         # Sequence analysis
         sequence = analysis.get('sequence', [])
-        if sequence:
-            sequence_label = Gtk.Label()
-            sequence_label.set_markup('<b>Pattern Analysis:</b>')
-            sequence_label.set_xalign(0)
-            self.analysis_box.pack_start(sequence_label, False, False, 0)
-            
-            # Add patterns sequentially right after the header
-            for i, pattern in enumerate(sequence[:5]):  # Show first 5 patterns
-                pattern_text = f"• {pattern.get('pattern', 'unknown')}: '{pattern.get('token', '')}'"
-                if 'dictionary_name' in pattern:
-                    pattern_text += f" (from {pattern['dictionary_name']})"
-                
-                pattern_label = Gtk.Label()
-                pattern_label.set_markup(pattern_text)
-                pattern_label.set_xalign(0)
-                pattern_label.set_line_wrap(True)
-                pattern_label.set_margin_start(20)
-                self.analysis_box.pack_start(pattern_label, False, False, 0)
+        self.set_row(self.sequence_header, visible=bool(sequence))
+        for i, label in enumerate(self.pattern_labels):
+            if i >= len(sequence):
+                self.set_row(label, visible=False)
+                continue
+            pattern = sequence[i]
+            token = pattern.get('token', '')
+            if len(token) > 40:
+                token = token[:40] + "…"
+            pattern_text = f"• {pattern.get('pattern', 'unknown')}: '{GLib.markup_escape_text(token)}'"
+            if 'dictionary_name' in pattern:
+                pattern_text += f" (from {pattern['dictionary_name']})"
+            self.set_row(label, pattern_text)
         
         # Crack time estimates
         crack_times = self.analyzer.get_crack_time_estimates(analysis)
         
-        for scenario, time_estimate in crack_times.items():
-            time_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-            
-            scenario_label = Gtk.Label()
-            scenario_label.set_markup(f'<b>{scenario}:</b>')
-            scenario_label.set_size_request(250, -1)
-            scenario_label.set_xalign(0)
-            
-            time_label = Gtk.Label()
-            time_label.set_markup(time_estimate)
-            time_label.set_xalign(0)
-            
-            time_box.pack_start(scenario_label, False, False, 0)
-            time_box.pack_start(time_label, True, True, 0)
-            
-            self.crack_time_box.pack_start(time_box, False, False, 0)
-        
-        self.analysis_box.show_all()
-        self.crack_time_box.show_all()
+        for scenario, (time_box, time_label) in self.crack_time_labels.items():
+            time_estimate = crack_times.get(scenario)
+            if time_estimate is not None:
+                self.set_row(time_label, time_estimate)
+            self.set_row(time_box, visible=time_estimate is not None)
     
     def on_copy_clicked(self, button):
         """Copy password to clipboard"""
@@ -749,7 +3791,1052 @@ class SecretSauceGUI:
         Gtk.main()
 
 
-if __name__ == "__main__":
+OUTPUT_FORMATS = ('raw', 'jsonl', 'csv')
+
+
+class PasswordStreamWriter:
+    """Write password batches in raw, JSONL or CSV form through one reused buffer"""
+    
+    def __init__(self, stream, fmt='raw'):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {fmt}")
+        self.stream = stream
+        self.format = fmt
+        self._buffer = None
+        self._layout = None
+        if fmt == 'csv':
+            stream.write(b"password\n")
+    
+    def _affixes(self):
+        if self.format == 'jsonl':
+            return b'{"password": "', b'"}\n'
+        if self.format == 'csv':
+            return b'"', b'"\n'
+        return b"", b"\n"
+    
+    def _needs_escaping(self, batch):
+        data, start, end = batch._buffer, batch._offsets[0], batch._offsets[-1]
+        if self.format == 'jsonl':
+            return data.find(b'"', start, end) >= 0 or data.find(b'\\', start, end) >= 0
+        if self.format == 'csv':
+            return data.find(b'"', start, end) >= 0
+        return False
+    
+    def write(self, batch):
+        """Write every password of a PasswordBatch"""
+        count = len(batch)
+        if not count:
+            return
+        length = batch.uniform_length()
+        if length is None or self._needs_escaping(batch):
+            self._write_slow(batch)
+            return
+        
+        prefix, suffix = self._affixes()
+        record = len(prefix) + length + len(suffix)
+        if self._layout != (length, count) or self._buffer is None:
+            # Allocate once per record layout; the fixed affixes are filled in up front
+            self._buffer = bytearray(record * count)
+            for i, byte in enumerate(prefix):
+                self._buffer[i::record] = bytes([byte]) * count
+            for i, byte in enumerate(suffix):
+                self._buffer[len(prefix) + length + i::record] = bytes([byte]) * count
+            self._layout = (length, count)
+        
+        # Scatter column c of every password into its record with one strided copy
+        data = batch.buffer
+        for column in range(length):
+            self._buffer[len(prefix) + column::record] = data[column::length]
+        self.stream.write(self._buffer)
+    
+    def _write_slow(self, batch):
+        """Per-record path for variable lengths or characters that need escaping"""
+        lines = []
+        for password in batch:
+            if self.format == 'jsonl':
+                lines.append(json.dumps({'password': password}, ensure_ascii=False))
+            elif self.format == 'csv':
+                lines.append('"' + password.replace('"', '""') + '"')
+            else:
+                lines.append(password)
+        self.stream.write(("\n".join(lines) + "\n").encode('utf-8'))
+
+
+class ServiceStats:
+    """Request counters and recent latencies behind the service's /stats endpoint"""
+    
+    # Latest requests kept for latency percentiles and the recent request rate
+    RECENT = 10000
+    RECENT_SECONDS = 10
+    
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = Counter()     # endpoint -> responses sent
+        self.errors = Counter()       # endpoint -> error responses other than overload
+        self.overloaded = Counter()   # endpoint -> requests refused with 503
+        self.batches = Counter()      # 'generate' or 'analysis' -> batches run
+        self.batched = Counter()      # 'generate' or 'analysis' -> requests in those batches
+        self._recent = deque(maxlen=self.RECENT)  # (finished, endpoint, seconds)
+    
+    def record(self, endpoint, seconds, status):
+        self.requests[endpoint] += 1
+        if status == 503:
+            self.overloaded[endpoint] += 1
+        elif status >= 400:
+            self.errors[endpoint] += 1
+        self._recent.append((time.monotonic(), endpoint, seconds))
+    
+    def record_batch(self, kind, requests):
+        self.batches[kind] += 1
+        self.batched[kind] += requests
+    
+    @staticmethod
+    def percentiles(samples):
+        """p50/p90/p99/max of latencies in seconds, as milliseconds"""
+        if not samples:
+            return {}
+        samples = sorted(samples)
+        
+        def at(q):
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+        
+        return {'p50_ms': at(0.5), 'p90_ms': at(0.9), 'p99_ms': at(0.99), 'max_ms': round(samples[-1] * 1000, 3)}
+    
+    def snapshot(self, **gauges):
+        """JSON-ready counters; gauges (queue depth and the like) are included as given"""
+        now = time.monotonic()
+        uptime = max(now - self.started, 1e-9)
+        # With a full deque the window is however far back it reaches
+        window_start = max(now - self.RECENT_SECONDS, self.started)
+        if len(self._recent) == self._recent.maxlen:
+            window_start = max(window_start, self._recent[0][0])
+        recent = sum(1 for finished, _, _ in self._recent if finished >= window_start)
+        
+        total = sum(self.requests.values())
+        return {
+            'uptime_seconds': round(uptime, 3),
+            'requests': total,
+            'requests_per_second': round(total / uptime, 1),
+            'recent_requests_per_second': round(recent / max(now - window_start, 1e-9), 1),
+            'endpoints': {endpoint: {'requests': self.requests[endpoint],
+                                     'errors': self.errors[endpoint],
+                                     'overloaded': self.overloaded[endpoint],
+                                     'latency': self.percentiles([seconds for _, name, seconds in self._recent
+                                                                  if name == endpoint])}
+                          for endpoint in sorted(self.requests)},
+            'batches': {kind: {'batches': count, 'mean_requests': round(self.batched[kind] / count, 2)}
+                        for kind, count in self.batches.items()},
+            **gauges,
+        }
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the service's queue is full; answered with 503"""
+
+
+class PasswordService:
+    """Headless local HTTP/JSON service for generation, analysis and validation
+    
+    POST /generate, /analyze and /validate take and return JSON objects, and
+    GET /stats returns ServiceStats counters. Generate requests that arrive
+    together with the same options are served by one generate_batch call.
+    Analysis and validation run on a bounded process pool: everything that
+    queued while the workers were busy goes out as one batch, so batches
+    grow with load instead of waiting on a timer. Once max_pending
+    passwords are queued, new requests are refused with 503 straight away;
+    generate requests count against the same budget, by output size.
+    """
+    
+    MAX_BODY = 1 << 20
+    MAX_GENERATE = 10000   # passwords per generate request
+    MAX_LENGTH = 4096
+    GENERATE_SLOT_CHARS = 1 << 16   # generated characters counted as one queued password
+    MAX_BATCH_CHARS = 1 << 22       # characters per generate_batch call; larger batches are split
+    INLINE_BATCH_CHARS = 1 << 16    # larger batches are generated off the event loop
+    MAX_ANALYZE = 1000     # passwords per analyze request
+    ROUTES = {'/generate': 'generate', '/analyze': 'analyze', '/validate': 'validate'}
+    REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+    
+    def __init__(self, workers=0, batch_size=64, max_pending=1024, dictionaries=(), breach_corpus=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        # Index paths, opened by each worker (memory-mapped, so shared)
+        self.dictionaries = list(dictionaries)
+        self.breach_corpus = breach_corpus
+        self.generator = PasswordGenerator()
+        self.stats = ServiceStats()
+        self._executor = None
+        self._pending = deque()   # (work items, future) waiting for a worker
+        self._queued = 0          # passwords in _pending
+        self._generating = 0      # queue budget held by unanswered generate requests
+        self._in_flight = 0       # batches in the pool
+        self._generation = {}     # options -> [(count, future)] gathered this loop turn
+    
+    async def serve(self, host='127.0.0.1', port=8765, socket_path=None):
+        """Run until cancelled, on a Unix socket when socket_path is given, else on host:port"""
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+        loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            # Start the workers and load zxcvbn before the first request needs it
+            await asyncio.gather(*(loop.run_in_executor(self._executor, _service_chunk, [], self.dictionaries,
+                                                        self.breach_corpus) for _ in range(self.workers)))
+            if socket_path:
+                server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+                where = socket_path
+            else:
+                server = await asyncio.start_server(self.handle_connection, host, port)
+                where = "http://%s:%d" % server.sockets[0].getsockname()[:2]
+            print(f"SecretSauce service listening on {where} with {self.workers} analysis workers", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+    
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, keeping it open between them"""
+        import asyncio
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                started = time.perf_counter()
+                request_line, *header_lines = head.decode('latin-1').split("\r\n")
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.split(" ")
+                
+                keep_alive = len(parts) == 3 and parts[2] == "HTTP/1.1" and headers.get('connection', '').lower() != 'close'
+                path = parts[1].split("?")[0] if len(parts) == 3 else ""
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if len(parts) != 3 or length < 0:
+                    status, payload, keep_alive = 400, {'error': "Malformed request"}, False
+                elif length > self.MAX_BODY:
+                    status, payload, keep_alive = 413, {'error': f"Request body exceeds {self.MAX_BODY} bytes"}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(parts[0], path, body)
+                
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                self.stats.record(path if path in self.ROUTES or path == '/stats' else 'other',
+                                  time.perf_counter() - started, status)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+    
+    def _response(self, status, payload, keep_alive):
+        try:
+            body = json.dumps(payload, ensure_ascii=False, allow_nan=False)
+        except ValueError:
+            # Guesses beyond float range are infinite; strict JSON has no Infinity
+            body = json.dumps(self._finite(payload), ensure_ascii=False, allow_nan=False)
+        body = body.encode('utf-8')
+        head = [f"HTTP/1.1 {status} {self.REASONS[status]}", "Content-Type: application/json",
+                f"Content-Length: {len(body)}", "Connection: " + ("keep-alive" if keep_alive else "close")]
+        if status == 503:
+            head.append("Retry-After: 1")
+        return ("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body
+    
+    @classmethod
+    def _finite(cls, value):
+        """Copy of a JSON-ready value with infinities and NaN replaced by null"""
+        if isinstance(value, float):
+            return value if math.isfinite(value) else None
+        if isinstance(value, dict):
+            return {key: cls._finite(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._finite(item) for item in value]
+        return value
+    
+    async def dispatch(self, method, path, body):
+        """Route one request; returns (HTTP status, JSON-ready payload)"""
+        if path == '/stats':
+            if method != 'GET':
+                return 405, {'error': "Use GET for /stats"}
+            return 200, self.stats.snapshot(queued_passwords=self._queued, generate_pending=self._generating,
+                                            batches_in_flight=self._in_flight,
+                                            workers=self.workers, max_pending=self.max_pending)
+        handler = self.ROUTES.get(path)
+        if handler is None:
+            return 404, {'error': f"Unknown endpoint {path}; use {', '.join(self.ROUTES)} or /stats"}
+        if method != 'POST':
+            return 405, {'error': f"Use POST for {path}"}
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError
+        except ValueError:
+            return 400, {'error': "Request body must be a JSON object"}
+        
+        try:
+            return 200, await getattr(self, handler)(request)
+        except ServiceOverloaded as e:
+            return 503, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+    
+    @staticmethod
+    def _int_field(request, name, default, low, high):
+        value = request.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+            raise ValueError(f"'{name}' must be an integer from {low} to {high}")
+        return value
+    
+    @staticmethod
+    def _bool_field(request, name):
+        value = request.get(name, True)
+        if not isinstance(value, bool):
+            raise ValueError(f"'{name}' must be true or false")
+        return value
+    
+    @staticmethod
+    def _passwords(request, limit):
+        passwords = [request['password']] if 'password' in request else request.get('passwords')
+        if not isinstance(passwords, list) or not 0 < len(passwords) <= limit or \
+                not all(isinstance(password, str) for password in passwords):
+            raise ValueError(f"Give 'password' as a string or 'passwords' as a list of 1 to {limit} strings")
+        return passwords
+    
+    async def generate(self, request):
+        """{count, length, lower, upper, digits, symbols} -> passwords and their search space"""
+        import asyncio
+        count = self._int_field(request, 'count', 1, 1, self.MAX_GENERATE)
+        options = (self._int_field(request, 'length', 64, 1, self.MAX_LENGTH),
+                   *(self._bool_field(request, name) for name in ('lower', 'upper', 'digits', 'symbols')))
+        cost = -(-count * options[0] // self.GENERATE_SLOT_CHARS)
+        self._admit(cost)
+        
+        future = asyncio.get_running_loop().create_future()
+        waiting = self._generation.get(options)
+        if waiting is None:
+            # Runs after the other requests already read this loop turn, so they join the batch
+            waiting = self._generation[options] = []
+            asyncio.get_running_loop().call_soon(self._generate_batch, options)
+        waiting.append((count, future))
+        self._generating += cost
+        try:
+            passwords, info = await future
+        finally:
+            self._generating -= cost
+        return {'passwords': passwords, 'search_space_log10': round(info.log10_space, 2)}
+    
+    def _generate_batch(self, options):
+        """Serve the generate requests gathered for one set of options"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        waiting = self._generation.pop(options)
+        total = sum(count for count, _ in waiting)
+        self.stats.record_batch('generate', len(waiting))
+        if total * options[0] > self.INLINE_BATCH_CHARS:
+            task = loop.run_in_executor(None, self._generate_passwords, total, options)
+            task.add_done_callback(functools.partial(self._generated, waiting))
+            return
+        
+        task = loop.create_future()
+        try:
+            task.set_result(self._generate_passwords(total, options))
+        except ValueError as e:
+            task.set_exception(e)
+        self._generated(waiting, task)
+    
+    def _generate_passwords(self, total, options):
+        """generate_batch() in slices of at most MAX_BATCH_CHARS characters"""
+        per_batch = max(1, self.MAX_BATCH_CHARS // options[0])
+        passwords = []
+        for start in range(0, total, per_batch):
+            batch = self.generator.generate_batch(min(per_batch, total - start), *options)
+            passwords.extend(batch)
+            batch.wipe()
+        return passwords, self.generator.generation_info(*options)
+    
+    def _generated(self, waiting, task):
+        try:
+            passwords, info = task.result()
+        except Exception as e:
+            for _, future in waiting:
+                if not future.done():
+                    future.set_exception(ValueError(str(e)) if isinstance(e, ValueError) else e)
+            return
+        
+        position = 0
+        for count, future in waiting:
+            if not future.done():
+                future.set_result((passwords[position:position + count], info))
+            position += count
+    
+    async def analyze(self, request):
+        """{password} or {passwords: [...]} -> analysis records, as for the analyze command"""
+        passwords = self._passwords(request, self.MAX_ANALYZE)
+        results = await self._run([('analyze', password, None) for password in passwords])
+        return results[0] if 'password' in request else {'results': results}
+    
+    async def validate(self, request):
+        """{password, min_score} -> whether it is acceptable and which stage decided"""
+        password = request.get('password')
+        if not isinstance(password, str):
+            raise ValueError("Give 'password' as a string")
+        min_score = self._int_field(request, 'min_score', 3, 0, 4)
+        return (await self._run([('validate', password, min_score)]))[0]
+    
+    async def _run(self, items):
+        """Queue work items for the process pool and wait for their results"""
+        import asyncio
+        self._admit(len(items))
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((items, future))
+        self._queued += len(items)
+        self._dispatch()
+        return await future
+    
+    def _admit(self, cost):
+        """Refuse work that could never fit the queue (400) or does not fit it right now (503)"""
+        if cost > self.max_pending:
+            raise ValueError(f"At most {self.max_pending} passwords can be queued at once")
+        queued = self._queued + self._generating
+        if queued + cost > self.max_pending:
+            raise ServiceOverloaded(f"Overloaded: {queued} passwords already queued; retry shortly")
+    
+    def _dispatch(self):
+        """Send queued work to the pool while fewer than two batches per worker are in flight"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while self._pending and self._in_flight < 2 * self.workers:
+            batch, requests = [], []
+            while self._pending and (not batch or len(batch) + len(self._pending[0][0]) <= self.batch_size):
+                items, future = self._pending.popleft()
+                self._queued -= len(items)
+                batch.extend(items)
+                requests.append((len(items), future))
+            self._in_flight += 1
+            self.stats.record_batch('analysis', len(requests))
+            task = loop.run_in_executor(self._executor, _service_chunk, batch, self.dictionaries, self.breach_corpus)
+            task.add_done_callback(functools.partial(self._batch_done, requests))
+    
+    def _batch_done(self, requests, task):
+        self._in_flight -= 1
+        try:
+            results = task.result()
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            position = 0
+            for count, future in requests:
+                if not future.done():
+                    future.set_result(results[position:position + count])
+                position += count
+        self._dispatch()
+
+
+def _policy_from_args(args):
+    """Build a PasswordPolicy when any policy-only option was given"""
+    if not (args.exclude or args.exclude_ambiguous or args.max_run or args.symbols):
+        return None
+    return PasswordPolicy(use_lower=not args.no_lower, use_upper=not args.no_upper,
+                          use_digits=not args.no_digits, use_symbols=not args.no_symbols,
+                          symbols=args.symbols, exclude=args.exclude or "",
+                          exclude_ambiguous=args.exclude_ambiguous, max_run=args.max_run)
+
+
+def cli_generate(args):
+    """Stream generated passwords to stdout or a file with constant memory"""
+    generator = PasswordGenerator(entropy=create_entropy_source(args.entropy, args.seed))
+    policy = _policy_from_args(args)
+    template = compile_template(args.template, generator.symbols) if args.template is not None else None
+    
+    if args.output and args.output != '-':
+        stream = open(args.output, 'wb', buffering=1 << 20)
+    else:
+        stream = sys.stdout.buffer
+    
+    try:
+        writer = PasswordStreamWriter(stream, args.format)
+        remaining = args.count
+        while remaining > 0:
+            n = min(args.batch_size, remaining)
+            if template is not None:
+                batch = generator.generate_batch_from_template(template, n)
+            elif policy is not None:
+                batch = generator.generate_batch_with_policy(policy, n, args.length)
+            else:
+                batch = generator.generate_batch(n, args.length, not args.no_lower, not args.no_upper,
+                                                 not args.no_digits, not args.no_symbols)
+            writer.write(batch)
+            batch.wipe()
+            remaining -= n
+        stream.flush()
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+    return 0
+
+
+def cli_passphrase(args):
+    """Stream diceware passphrases drawn from a memory-mapped wordlist"""
+    wordlist = Wordlist(args.wordlist)
+    generator = PassphraseGenerator(wordlist, create_entropy_source(args.entropy, args.seed))
+    print(f"Entropy: {generator.entropy_bits(args.words):.2f} bits "
+          f"({args.words} words from {len(wordlist):,})", file=sys.stderr)
+    
+    if args.output and args.output != '-':
+        stream = open(args.output, 'wb', buffering=1 << 20)
+    else:
+        stream = sys.stdout.buffer
+    
+    try:
+        writer = PasswordStreamWriter(stream, args.format)
+        remaining = args.count
+        while remaining > 0:
+            n = min(args.batch_size, remaining)
+            writer.write(generator.generate_batch(n, args.words, args.separator))
+            remaining -= n
+        stream.flush()
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+        wordlist.close()
+    return 0
+
+
+def cli_index_wordlist(args):
+    """Prebuild the offset index for a wordlist"""
+    wordlist = Wordlist(args.wordlist)
+    print(f"Indexed {len(wordlist):,} words from {args.wordlist} into {wordlist.index_path}", file=sys.stderr)
+    wordlist.close()
+    return 0
+
+
+def cli_index_dictionary(args):
+    """Build a memory-mapped organization dictionary index from word files"""
+    count = RankedIndex.build_from_files(args.index, args.wordfiles, args.name)
+    print(f"Indexed {count:,} words from {len(args.wordfiles)} file(s) into {args.index}", file=sys.stderr)
+    return 0
+
+
+def cli_index_breaches(args):
+    """Build a breach corpus from raw SHA-1 dumps"""
+    count, skipped = BreachCorpus.build(args.corpus, args.dumps, args.bits_per_entry)
+    print(f"Indexed {count:,} breached password hashes into {args.corpus}", file=sys.stderr)
+    if skipped:
+        print(f"Skipped {skipped:,} lines that were not SHA-1 hashes", file=sys.stderr)
+    return 0
+
+
+# Per-process analyzer for the analyze command's worker pool
+_worker_analyzer = None
+
+
+def _get_worker_analyzer(cache_size=0, dictionaries=(), breach_corpus=None):
+    """This worker process's analyzer, created on its first chunk"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        # Dictionary indexes and the breach corpus are memory-mapped, so every worker shares their pages
+        _worker_analyzer = PasswordAnalyzer(cache=AnalysisCache(cache_size) if cache_size else None,
+                                            dictionaries=dictionaries, breach_corpus=breach_corpus)
+    return _worker_analyzer
+
+
+def _analyze_chunk(chunk, include_password=False, cache_size=0, dictionaries=(), breach_corpus=None):
+    """Analyze (line number, password) pairs in a worker; returns JSONL text"""
+    analyzer = _get_worker_analyzer(cache_size, dictionaries, breach_corpus)
+    lines = []
+    for line_number, password in chunk:
+        try:
+            record = analyzer.to_record(analyzer.analyze(password, max_patterns=0))
+        except ValueError as e:
+            record = {'error': str(e)}
+        record = {'line': line_number, **record}
+        if include_password:
+            record['password'] = password
+        lines.append(json.dumps(record, ensure_ascii=False))
+    return "\n".join(lines) + "\n"
+
+
+def _read_chunks(stream, size):
+    """Yield lists of (line number, password) from a newline-delimited stream"""
+    chunk = []
+    for line_number, line in enumerate(stream, 1):
+        chunk.append((line_number, line.rstrip("\r\n")))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _audit_chunk(chunk, dictionaries=(), breach_corpus=None):
+    """Analyze (password number, password) pairs in a worker; returns (number, AnalysisResult or error) pairs"""
+    analyzer = _get_worker_analyzer(0, dictionaries, breach_corpus)
+    results = []
+    for number, password in chunk:
+        try:
+            results.append((number, analyzer.analyze(password, max_patterns=0)))
+        except ValueError as e:
+            results.append((number, str(e)))
+    return results
+
+
+def _service_chunk(items, dictionaries=(), breach_corpus=None):
+    """Run a PasswordService batch of ('analyze' or 'validate', password, min_score) in a worker"""
+    analyzer = _get_worker_analyzer(0, dictionaries, breach_corpus)
+    load_zxcvbn()
+    results = []
+    for kind, password, min_score in items:
+        try:
+            if kind == 'validate':
+                verdict = analyzer.validate(password, min_score)
+                results.append({'valid': verdict.valid, 'stage': verdict.stage, 'score': verdict.score,
+                                'guesses_log10': verdict.guesses_log10})
+            else:
+                results.append(analyzer.to_record(analyzer.analyze(password, max_patterns=0)))
+        except ValueError as e:
+            results.append({'error': str(e)})
+    return results
+
+
+# Column names (lowercased) in password manager CSV exports: Bitwarden,
+# KeePass/KeePassXC, 1Password and browser exports
+VAULT_COLUMNS = {
+    'password': ('login_password', 'password'),
+    'name': ('name', 'title', 'account'),
+    'username': ('login_username', 'username', 'user name', 'login name', 'login'),
+}
+
+
+def _vault_columns(header, password_column=None):
+    """{field: column number} for a vault export's header row"""
+    names = [name.strip().lower() for name in header]
+    columns = {}
+    for field, candidates in VAULT_COLUMNS.items():
+        if field == 'password' and password_column:
+            candidates = (password_column.strip().lower(),)
+        for candidate in candidates:
+            if candidate in names:
+                columns[field] = names.index(candidate)
+                break
+    if 'password' not in columns:
+        raise ValueError("No password column in the export; name it with --password-column")
+    return columns
+
+
+def cli_audit(args):
+    """Audit a password manager CSV export: strength, breaches, and exact and near-duplicate reuse"""
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    dictionaries = args.dictionary or []
+    # Fail before starting workers if zxcvbn is missing or a dictionary or the corpus is unusable
+    analyzer = PasswordAnalyzer(dictionaries=dictionaries, breach_corpus=args.breaches)
+    analyzer.ranked_dictionaries()
+    reuse = ReuseIndex(args.similarity)
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    
+    # Only (row, name, username, password number) is kept per entry; each
+    # distinct password is analyzed once and held only until it is sent off
+    entries = []
+    results = {}
+    source = sys.stdin if args.input in (None, '-') else open(args.input, newline='', encoding='utf-8-sig')
+    try:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("The export is empty")
+        columns = _vault_columns(header, args.password_column)
+        
+        def field(row, name):
+            column = columns.get(name)
+            return row[column] if column is not None and column < len(row) else ""
+        
+        def collect(futures):
+            for future in futures:
+                pending.remove(future)
+                results.update(future.result())
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            chunk = []
+            for row_number, row in enumerate(reader, 1):
+                password = field(row, 'password')
+                if not password:
+                    continue
+                number, new = reuse.add(password)
+                entries.append((row_number, field(row, 'name'), field(row, 'username'), number))
+                if new:
+                    chunk.append((number, password))
+                if len(chunk) >= args.chunk_size:
+                    pending.add(executor.submit(_audit_chunk, chunk, dictionaries, args.breaches))
+                    chunk = []
+                    # Backpressure: never read further ahead than max_in_flight chunks
+                    while len(pending) >= max_in_flight:
+                        collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+            if chunk:
+                pending.add(executor.submit(_audit_chunk, chunk, dictionaries, args.breaches))
+            collect(wait(pending)[0])
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    
+    groups = reuse.groups()
+    reuse_sizes = Counter(reuse_group for reuse_group, _ in groups if reuse_group)
+    similar_sizes = Counter(similar_group for _, similar_group in groups if similar_group)
+    weak = breached = 0
+    output = sys.stdout if args.output in (None, '-') else open(args.output, 'w', encoding='utf-8')
+    try:
+        for (row_number, name, username, number), (reuse_group, similar_group) in zip(entries, groups):
+            record = {'row': row_number, 'name': name, 'username': username}
+            result = results[number]
+            if isinstance(result, str):
+                record['error'] = result
+            else:
+                record.update(analyzer.to_record(result))
+                weak += result.score < args.min_score
+                breached += bool(result.breached)
+            if reuse_group:
+                record['reuse_group'] = reuse_group
+                record['reused'] = reuse_sizes[reuse_group] - 1
+            if similar_group:
+                record['similar_group'] = similar_group
+                record['similar'] = similar_sizes[similar_group] - 1
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    summary = (f"Audited {len(entries):,} entries ({len(results):,} distinct passwords): "
+               f"{weak:,} below score {args.min_score}, "
+               f"{sum(reuse_sizes.values()):,} reusing a password ({len(reuse_sizes):,} groups), "
+               f"{sum(similar_sizes.values()):,} near-duplicates ({len(similar_sizes):,} groups)")
+    if analyzer.breach_corpus is not None:
+        summary += f", {breached:,} breached"
+    print(summary, file=sys.stderr)
+    return 0
+
+
+def cli_serve(args):
+    """Run the local generation and analysis service until interrupted"""
+    import asyncio
+    # Fail before listening if zxcvbn is missing or a dictionary or the corpus is unusable
+    PasswordAnalyzer(dictionaries=args.dictionary or [], breach_corpus=args.breaches).ranked_dictionaries()
+    service = PasswordService(args.workers, args.batch_size, args.max_pending, args.dictionary or [], args.breaches)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+async def _http_request(reader, writer, method, path, payload=None):
+    """Send one keep-alive HTTP/1.1 request; returns (status, decoded JSON body)"""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+    length = 0
+    for line in head[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return int(head[0].split(" ")[1]), json.loads(await reader.readexactly(length) or b"null")
+
+
+async def _load_test(args):
+    import asyncio
+    
+    def connect():
+        if args.socket:
+            return asyncio.open_unix_connection(args.socket)
+        return asyncio.open_connection(args.host, args.port)
+    
+    # A mix of guessable and random passwords, so every validation stage gets exercised
+    generator = PasswordGenerator()
+    words = ("password", "summer", "dragon", "monkey", "letmein", "football", "sunshine", "shadow")
+    samples = [f"{words[k % len(words)].capitalize()}{1990 + k % 35}!" for k in range(64)]
+    samples += generator.generate_batch(192, 12)
+    samples += generator.generate_batch(64, 20)
+    
+    latencies = []
+    statuses = Counter()
+    remaining = args.requests
+    
+    async def client(number):
+        nonlocal remaining
+        reader, writer = await connect()
+        try:
+            while remaining > 0:
+                remaining -= 1
+                password = samples[(remaining * 7 + number) % len(samples)]
+                if args.endpoint == 'generate':
+                    payload = {'count': 1, 'length': 20}
+                elif args.endpoint == 'validate':
+                    payload = {'password': password, 'min_score': 3}
+                else:
+                    payload = {'password': password}
+                started = time.perf_counter()
+                status, _ = await _http_request(reader, writer, 'POST', '/' + args.endpoint, payload)
+                latencies.append(time.perf_counter() - started)
+                statuses[status] += 1
+        finally:
+            writer.close()
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    reader, writer = await connect()
+    try:
+        _, stats = await _http_request(reader, writer, 'GET', '/stats')
+    finally:
+        writer.close()
+    return elapsed, latencies, statuses, stats
+
+
+def cli_load_test(args):
+    """Load-test a running service from this machine and report throughput and latency"""
+    import asyncio
+    elapsed, latencies, statuses, stats = asyncio.run(_load_test(args))
+    print(f"{len(latencies):,} {args.endpoint} requests in {elapsed:.2f}s from {args.concurrency} connections: "
+          f"{len(latencies) / elapsed:,.0f} requests/s")
+    latency = ServiceStats.percentiles(latencies)
+    print("latency " + ", ".join(f"{name[:-3]} {value:.2f} ms" for name, value in latency.items()))
+    print("status " + ", ".join(f"{status}: {count:,}" for status, count in sorted(statuses.items())))
+    for kind, batches in stats.get('batches', {}).items():
+        print(f"service {kind} batches: {batches['batches']:,}, {batches['mean_requests']} requests each on average")
+    return 0
+
+
+def cli_analyze(args):
+    """Stream a password file through zxcvbn on a process pool, writing JSONL"""
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    # Fail before starting workers if zxcvbn is missing or a dictionary or the corpus is unusable
+    dictionaries = args.dictionary or []
+    PasswordAnalyzer(dictionaries=dictionaries, breach_corpus=args.breaches).ranked_dictionaries()
+    workers = args.workers or os.cpu_count() or 1
+    # Backpressure: never read further ahead than this many chunks
+    max_in_flight = workers * 2
+    
+    source = sys.stdin if args.input in (None, '-') else open(args.input, encoding='utf-8', errors='replace')
+    output = sys.stdout if args.output in (None, '-') else open(args.output, 'w', encoding='utf-8')
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in _read_chunks(source, args.chunk_size):
+                pending.append(executor.submit(_analyze_chunk, chunk, args.include_password,
+                                               args.cache_size, dictionaries, args.breaches))
+                while len(pending) >= max_in_flight:
+                    if args.ordered:
+                        output.write(pending.popleft().result())
+                    else:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            pending.remove(future)
+                            output.write(future.result())
+            while pending:
+                output.write(pending.popleft().result())
+        output.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def build_arg_parser():
+    """Command line interface; running without a command starts the GUI"""
+    parser = argparse.ArgumentParser(prog="password.py", description="SecretSauce password generator and validator")
+    parser.add_argument('--install-deps', action='store_true',
+                        help="install missing Python dependencies (zxcvbn) before running")
+    commands = parser.add_subparsers(dest='command')
+    
+    generate = commands.add_parser('generate', help="generate passwords without the GUI")
+    generate.add_argument('--count', type=int, default=1, help="number of passwords (default: 1)")
+    generate.add_argument('--length', type=int, default=64, help="password length (default: 64)")
+    generate.add_argument('--format', choices=OUTPUT_FORMATS, default='raw', help="output format (default: raw)")
+    generate.add_argument('--output', '-o', help="output file (default: stdout)")
+    generate.add_argument('--batch-size', type=int, default=65536, help="passwords per write (default: 65536)")
+    generate.add_argument('--no-lower', action='store_true', help="exclude a-z")
+    generate.add_argument('--no-upper', action='store_true', help="exclude A-Z")
+    generate.add_argument('--no-digits', action='store_true', help="exclude 0-9")
+    generate.add_argument('--no-symbols', action='store_true', help="exclude symbols")
+    generate.add_argument('--symbols', help="custom symbol set")
+    generate.add_argument('--exclude', help="characters never to use")
+    generate.add_argument('--exclude-ambiguous', action='store_true', help="skip look-alike characters such as 0/O and 1/l")
+    generate.add_argument('--max-run', type=int, help="maximum run of identical characters")
+    generate.add_argument('--template', help="pattern template such as 'Cvcc-dddd-SSSS' or '(x{8}-){3}x{8}'")
+    generate.add_argument('--entropy', choices=sorted(ENTROPY_SOURCES), default='buffered', help="entropy source (default: buffered)")
+    generate.add_argument('--seed', help="deterministic output for benchmarks and tests only")
+    generate.set_defaults(handler=cli_generate)
+    
+    passphrase = commands.add_parser('passphrase', help="generate diceware passphrases from a wordlist")
+    passphrase.add_argument('--wordlist', required=True, help="wordlist file, one word (or diceware line) per line")
+    passphrase.add_argument('--words', type=int, default=6, help="words per passphrase (default: 6)")
+    passphrase.add_argument('--separator', default="-", help="word separator (default: -)")
+    passphrase.add_argument('--count', type=int, default=1, help="number of passphrases (default: 1)")
+    passphrase.add_argument('--format', choices=OUTPUT_FORMATS, default='raw', help="output format (default: raw)")
+    passphrase.add_argument('--output', '-o', help="output file (default: stdout)")
+    passphrase.add_argument('--batch-size', type=int, default=4096, help="passphrases per write (default: 4096)")
+    passphrase.add_argument('--entropy', choices=sorted(ENTROPY_SOURCES), default='buffered', help="entropy source (default: buffered)")
+    passphrase.add_argument('--seed', help="deterministic output for benchmarks and tests only")
+    passphrase.set_defaults(handler=cli_passphrase)
+    
+    analyze = commands.add_parser('analyze', help="analyze newline-delimited passwords with zxcvbn on all cores")
+    analyze.add_argument('--input', '-i', help="password file, one per line (default: stdin)")
+    analyze.add_argument('--output', '-o', help="JSONL output file (default: stdout)")
+    analyze.add_argument('--workers', type=int, default=0, help="worker processes (default: all cores)")
+    analyze.add_argument('--chunk-size', type=int, default=256, help="passwords per work unit (default: 256)")
+    analyze.add_argument('--ordered', action='store_true', help="write results in input order")
+    analyze.add_argument('--include-password', action='store_true', help="include the password in each record")
+    analyze.add_argument('--cache-size', type=int, default=0,
+                         help="per-worker cache of results for repeated passwords, 0 disables (default: 0)")
+    analyze.add_argument('--dictionary', '-d', action='append', metavar='INDEX',
+                         help="organization dictionary index to match as well (repeatable)")
+    analyze.add_argument('--breaches', metavar='CORPUS', help="breach corpus to check every password against")
+    analyze.set_defaults(handler=cli_analyze)
+    
+    audit = commands.add_parser('audit', help="audit a password manager CSV export for weak, breached and reused passwords")
+    audit.add_argument('--input', '-i', help="CSV export from Bitwarden, KeePass, 1Password or a browser (default: stdin)")
+    audit.add_argument('--output', '-o', help="JSONL report, one record per entry (default: stdout)")
+    audit.add_argument('--password-column', help="password column name, when it is not detected")
+    audit.add_argument('--similarity', type=float, default=0.4,
+                       help="n-gram similarity (0-1] that makes two passwords near-duplicates (default: 0.4)")
+    audit.add_argument('--min-score', type=int, default=3, help="entries scoring below this count as weak (default: 3)")
+    audit.add_argument('--workers', type=int, default=0, help="worker processes (default: all cores)")
+    audit.add_argument('--chunk-size', type=int, default=256, help="passwords per work unit (default: 256)")
+    audit.add_argument('--dictionary', '-d', action='append', metavar='INDEX',
+                       help="organization dictionary index to match as well (repeatable)")
+    audit.add_argument('--breaches', metavar='CORPUS', help="breach corpus to check every password against")
+    audit.set_defaults(handler=cli_audit)
+    
+    serve = commands.add_parser('serve', help="run a local HTTP/JSON service for generate, analyze and validate")
+    serve.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=8765, help="port to listen on (default: 8765)")
+    serve.add_argument('--socket', help="listen on this Unix socket instead of a TCP port")
+    serve.add_argument('--workers', type=int, default=0, help="analysis worker processes (default: all cores)")
+    serve.add_argument('--batch-size', type=int, default=64, help="most passwords sent to a worker at once (default: 64)")
+    serve.add_argument('--max-pending', type=int, default=1024,
+                       help="queued passwords beyond which requests get 503 (default: 1024)")
+    serve.add_argument('--dictionary', '-d', action='append', metavar='INDEX',
+                       help="organization dictionary index to match as well (repeatable)")
+    serve.add_argument('--breaches', metavar='CORPUS', help="breach corpus to check passwords against")
+    serve.set_defaults(handler=cli_serve)
+    
+    load_test = commands.add_parser('load-test', help="load-test a running service from this machine")
+    load_test.add_argument('--host', default='127.0.0.1', help="service address (default: 127.0.0.1)")
+    load_test.add_argument('--port', type=int, default=8765, help="service port (default: 8765)")
+    load_test.add_argument('--socket', help="service Unix socket, instead of host and port")
+    load_test.add_argument('--endpoint', choices=('validate', 'analyze', 'generate'), default='validate',
+                           help="endpoint to call (default: validate)")
+    load_test.add_argument('--requests', type=int, default=10000, help="total requests (default: 10000)")
+    load_test.add_argument('--concurrency', type=int, default=32, help="concurrent connections (default: 32)")
+    load_test.set_defaults(handler=cli_load_test)
+    
+    gui = commands.add_parser('gui', help="start the graphical interface (the default)")
+    gui.add_argument('--pool-size', type=int, default=3, help="passwords pre-generated in the background, 0 disables (default: 3)")
+    gui.add_argument('--highlight-stride', type=int, default=8, help="highlight every Nth character, 0 disables (default: 8)")
+    gui.add_argument('--dictionary', '-d', action='append', metavar='INDEX',
+                     help="organization dictionary index to match as well (repeatable)")
+    gui.add_argument('--breaches', metavar='CORPUS', help="breach corpus to check passwords against")
+    gui.set_defaults(handler=run_gui)
+    
+    index_wordlist = commands.add_parser('index-wordlist', help="prebuild the offset index for a wordlist")
+    index_wordlist.add_argument('wordlist', help="wordlist file")
+    index_wordlist.set_defaults(handler=cli_index_wordlist)
+    
+    index_dictionary = commands.add_parser('index-dictionary',
+                                           help="build an organization dictionary index for analysis")
+    index_dictionary.add_argument('index', help="index file to write")
+    index_dictionary.add_argument('wordfiles', nargs='+',
+                                  help="word files, one word per line, most common first; one dictionary each")
+    index_dictionary.add_argument('--name', action='append',
+                                  help="dictionary name per word file, in order (default: file name)")
+    index_dictionary.set_defaults(handler=cli_index_dictionary)
+    
+    index_breaches = commands.add_parser('index-breaches',
+                                         help="convert breached-password SHA-1 dumps into a breach corpus")
+    index_breaches.add_argument('corpus', help="corpus file to write")
+    index_breaches.add_argument('dumps', nargs='+', help="dump files with 'SHA1HEX' or 'SHA1HEX:count' lines")
+    index_breaches.add_argument('--bits-per-entry', type=int, default=10,
+                                help="Bloom filter size; 10 lets about 1%% of absent passwords through (default: 10)")
+    index_breaches.set_defaults(handler=cli_index_breaches)
+    
+    return parser
+
+
+def main(argv=None):
+    """Dispatch to a command line tool or start the GUI"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        parser = build_arg_parser()
+        args = parser.parse_args(argv)
+        if args.install_deps:
+            status = check_and_install_requirements()
+            if status or args.command is None:
+                return status
+        if args.command is None:
+            parser.print_help()
+            return 0
+        if getattr(args, 'count', 1) < 0 or getattr(args, 'batch_size', 1) < 1:
+            parser.error("--count must not be negative and --batch-size must be positive")
+        if getattr(args, 'workers', 0) < 0 or getattr(args, 'chunk_size', 1) < 1:
+            parser.error("--workers must not be negative and --chunk-size must be positive")
+        if getattr(args, 'cache_size', 0) < 0:
+            parser.error("--cache-size must not be negative")
+        if getattr(args, 'batch_size', 1) < 1 or getattr(args, 'max_pending', 1) < 1 or \
+                getattr(args, 'requests', 1) < 1 or getattr(args, 'concurrency', 1) < 1:
+            parser.error("--batch-size, --max-pending, --requests and --concurrency must be positive")
+        try:
+            return args.handler(args)
+        except BrokenPipeError:
+            # Downstream consumer (e.g. head) closed the pipe early
+            sys.stderr.close()
+            return 0
+        except (ValueError, ImportError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+    
+    return run_gui()
+
+
+def run_gui(args=None):
+    """Start the GTK application"""
+    load_gtk()
+    try:
+        load_zxcvbn()
+    except ImportError:
+        print("SecretSauce requires the 'zxcvbn' package.")
+        print("Run 'python3 password.py --install-deps' to install it automatically, or")
+        print_install_help()
+        return 1
     print("Starting SecretSauce 2.0...")
-    app = SecretSauceGUI()
+    if args:
+        app = SecretSauceGUI(pool_size=args.pool_size, highlight_stride=args.highlight_stride,
+                             dictionaries=args.dictionary or (), breach_corpus=args.breaches)
+    else:
+        app = SecretSauceGUI()
     app.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
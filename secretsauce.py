@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""SecretSauce command line launcher
+
+Python never caches bytecode for the script it is asked to run, so
+``python3 password.py`` compiles the whole application on every start.
+Run through this launcher, password.py is imported and its cached .pyc
+is used instead.
+"""
+
+import sys
+
+from password import main
+
+if __name__ == "__main__":
+    sys.exit(main())
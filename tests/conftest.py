@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep dictionary snapshots and indexes built by the tests out of the user's cache
+os.environ.setdefault("XDG_CACHE_HOME", tempfile.mkdtemp(prefix="secretsauce-tests-"))
@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+import password
+
+
+zxcvbn = pytest.importorskip("zxcvbn")
+
+
+def _exact(candidate):
+    # zxcvbn()'s own length limit would refuse these, so run its pipeline directly
+    matches = zxcvbn.matching.omnimatch(candidate)
+    return zxcvbn.scoring.most_guessable_match_sequence(candidate, matches)
+
+
+def _long_passwords():
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("bounded"))
+    yield from generator.generate_batch(3, 60)
+    yield "correcthorsebatterystaple" * 3
+    yield "Password123!" * 6
+    yield "qwertyuiopasdfghjkl" + "1234567890" * 4 + "zxcvbnm"
+    yield "summer2024winter2023spring2022autumn2021" + "monkeydragonfootball"
+    yield "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+    yield "ilovemydog" + "".join(generator.generate_batch(1, 30)) + "ilovemydog!!"
+    yield "01/02/1990 " * 5 + "abcdefghijklmnopqrstuvwxyz"
+
+
+@pytest.mark.parametrize("candidate", list(_long_passwords()))
+def test_bounded_result_never_exceeds_exact_zxcvbn(candidate):
+    analyzer = password.PasswordAnalyzer(exact_length=16, window=16)
+    bounded = analyzer.analyze_bounded(candidate)
+    assert bounded['approximate']
+    exact_log10 = math.log10(_exact(candidate)['guesses'])
+    assert bounded['guesses_log10'] <= exact_log10 + 1e-9
+    assert bounded['score'] <= analyzer._score_from_log10(exact_log10)
+
+
+def test_bounded_analysis_is_deterministic_without_time_budget():
+    candidate = "".join(password.PasswordGenerator(entropy=password.SeededEntropySource(1)).generate_batch(1, 4096))
+    analyzer = password.PasswordAnalyzer()
+    first = analyzer.analyze_password(candidate)
+    assert 'timed_out' not in first
+    assert analyzer.analyze_password(candidate)['guesses_log10'] == first['guesses_log10']
+
+
+def test_timed_out_results_are_not_cached():
+    candidate = "".join(password.PasswordGenerator(entropy=password.SeededEntropySource(2)).generate_batch(1, 2048))
+    analyzer = password.PasswordAnalyzer(time_budget=0.0, cache=password.AnalysisCache(16))
+    result = analyzer.analyze(candidate)
+    assert result.guesses_log10 > 0
+    assert analyzer.cache.get(candidate, 5) is None
+    
+    analyzer = password.PasswordAnalyzer(cache=password.AnalysisCache(16))
+    analyzer.analyze(candidate)
+    assert analyzer.cache.get(candidate, 5) is not None
+
+
+def test_cached_results_keep_patterns_for_later_callers():
+    analyzer = password.PasswordAnalyzer(cache=password.AnalysisCache(16))
+    candidate = "correcthorse1990qwerty"
+    assert analyzer.analyze(candidate, max_patterns=0).patterns == ()
+    uncached = password.PasswordAnalyzer().analyze(candidate, max_patterns=5)
+    cached = analyzer.analyze(candidate, max_patterns=5)
+    assert analyzer.cache.hits == 1
+    assert cached.patterns == uncached.patterns and len(cached.patterns) > 1
+    assert len(analyzer.analyze(candidate, max_patterns=1).patterns) == 1
+
+
+def test_typed_passwords_are_exact_up_to_zxcvbn_limit():
+    analyzer = password.PasswordAnalyzer(exact_length=password.SecretSauceGUI.CHECK_EXACT_LENGTH)
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("typed"))
+    for length in (25, 48, 72):
+        candidate = "".join(generator.generate_batch(1, length))
+        result = analyzer.analyze_password(candidate)
+        assert not result.get('approximate')
+        assert result['guesses'] == zxcvbn.zxcvbn(candidate)['guesses']
+    assert analyzer.analyze_password("".join(generator.generate_batch(1, 73)))['approximate']
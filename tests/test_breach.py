@@ -0,0 +1,88 @@
+import hashlib
+from collections import Counter
+
+import pytest
+
+import password
+
+
+def _sha1(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def breach_dump(tmp_path):
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("breach"))
+    breached = list(generator.generate_batch(5000, 10)) + ["hunter2", "password", "Summer2024!", "пароль"]
+    expected = Counter()
+    lines = ["not a hash", ""]
+    for number, candidate in enumerate(breached):
+        times = number % 7 + 1
+        expected[candidate] += times
+        digest = _sha1(candidate)
+        # Mixed case, bare hashes and counts, as real dumps have
+        if number % 3:
+            lines.append(f"{digest.upper()}:{times}")
+        else:
+            lines.append(digest if times == 1 else f"{digest}:{times}")
+    # Duplicates across files are summed
+    first, second = tmp_path / "part1.txt", tmp_path / "part2.txt"
+    first.write_text("\n".join(lines) + "\n")
+    second.write_text(f"{_sha1('hunter2').upper()}:100\n")
+    expected["hunter2"] += 100
+    return [str(first), str(second)], expected
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_breach_corpus_has_no_false_negatives(tmp_path, breach_dump, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(password, "load_numpy", lambda: None)
+    sources, expected = breach_dump
+    path = str(tmp_path / "breaches.idx")
+    # A small run size forces several sorted runs through the merge
+    count, skipped = password.BreachCorpus.build(path, sources, bits_per_entry=4, run_size=997)
+    assert count == len(expected)
+    assert skipped == 1
+    
+    corpus = password.BreachCorpus(path)
+    assert len(corpus) == len(expected)
+    for candidate, times in expected.items():
+        assert corpus.lookup(candidate) == times, candidate
+    
+    # Records are confirmed after the filter, so absent passwords are never reported
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("absent"))
+    for candidate in generator.generate_batch(5000, 11):
+        assert not corpus.lookup(candidate)
+    assert corpus.stats['found'] == len(expected)
+    assert corpus.stats['filtered'] > 0
+
+
+def test_analyzer_flags_breached_passwords(tmp_path, breach_dump):
+    pytest.importorskip("zxcvbn")
+    sources, expected = breach_dump
+    path = str(tmp_path / "breaches.idx")
+    password.BreachCorpus.build(path, sources)
+    analyzer = password.PasswordAnalyzer(breach_corpus=path)
+    assert analyzer.analyze_password("hunter2")['breached'] == expected["hunter2"]
+    assert not analyzer.validate("Summer2024!", 1)
+
+
+def test_window_cache_entries_never_hide_a_breach(tmp_path):
+    pytest.importorskip("zxcvbn")
+    breached = "Xk9#mQ2$vL7!pR4@"
+    dump = tmp_path / "dump.txt"
+    dump.write_text(f"{_sha1(breached).upper()}:5\n")
+    path = str(tmp_path / "breaches.idx")
+    password.BreachCorpus.build(path, [str(dump)])
+    # A check analyzer that is exact up to 24 characters, with 16-character windows beyond
+    analyzer = password.PasswordAnalyzer(exact_length=24, cache=password.AnalysisCache(64), breach_corpus=path)
+    
+    assert analyzer.analyze(breached).breached == 5
+    analyzer.cache.clear()
+    # The long password's first window is exactly the breached password
+    analyzer.analyze(breached + "Tz8&wN3^bH6*")
+    result = analyzer.analyze(breached)
+    assert result.breached == 5
+    assert result.score < 4
@@ -0,0 +1,44 @@
+import itertools
+import math
+
+import pytest
+
+import password
+
+
+def _small_generator(seed):
+    generator = password.PasswordGenerator(backend='python', entropy=password.SeededEntropySource(seed))
+    generator.lowercase, generator.uppercase, generator.digits, generator.symbols = "ab", "CDE", "0", "#!"
+    return generator
+
+
+def _class_count(candidate, generator):
+    classes = generator._selected_classes(True, True, True, True)
+    return sum(any(c in chars for c in candidate) for chars in classes)
+
+
+@pytest.mark.parametrize("length", [1, 2, 3, 4, 5])
+def test_generation_info_counts_the_real_output_space(length):
+    generator = _small_generator(length)
+    alphabet = "abCDE0#!"
+    # Every output covers min(length, classes) classes, and every such string can be drawn
+    wanted = min(length, 4)
+    support = {"".join(p) for p in itertools.product(alphabet, repeat=length)
+               if _class_count(p, generator) == wanted}
+    info = generator.generation_info(length)
+    assert info.log10_space == pytest.approx(math.log10(len(support)))
+    
+    drawn = set(generator.generate_batch(len(support) * 30, length))
+    assert drawn == support
+
+
+@pytest.mark.parametrize("length", [2, 3])
+def test_short_passwords_with_four_classes_get_a_finite_score(length):
+    pytest.importorskip("zxcvbn")
+    generator = password.PasswordGenerator()
+    info = generator.generation_info(length)
+    assert math.isfinite(info.log10_space) and info.log10_space > 0
+    candidate = generator.generate(length)
+    assert len(candidate) == length
+    analysis = password.PasswordAnalyzer().analyze_password(candidate, info)
+    assert analysis['guesses'] > 1
@@ -0,0 +1,78 @@
+import itertools
+import math
+from collections import Counter
+
+import pytest
+
+import password
+
+
+def _compliant(candidate, classes, minimums, max_run):
+    for chars, minimum in zip(classes, minimums):
+        if sum(c in chars for c in candidate) < minimum:
+            return False
+    if max_run:
+        for _char, run in itertools.groupby(candidate):
+            if len(list(run)) > max_run:
+                return False
+    return True
+
+
+def _enumerate(classes, minimums, length, max_run):
+    alphabet = "".join(classes)
+    return {"".join(p) for p in itertools.product(alphabet, repeat=length)
+            if _compliant(p, classes, minimums, max_run)}
+
+
+@pytest.mark.parametrize("classes, minimums, length, max_run", [
+    (["abc", "01"], [1, 2], 4, None),
+    (["abc", "01"], [1, 1], 4, 1),
+    (["ab", "0", "#"], [1, 1, 0], 5, 2),
+])
+def test_policy_sampler_is_uniform_over_compliant_passwords(classes, minimums, length, max_run):
+    expected = _enumerate(classes, minimums, length, max_run)
+    sampler = password.PolicySampler(classes, minimums, length, max_run)
+    assert sampler.log10_space == pytest.approx(math.log10(len(expected)))
+    
+    entropy = password.SeededEntropySource("policy uniformity")
+    per_outcome = 200
+    draws = len(expected) * per_outcome
+    counts = Counter(sampler.sample(entropy).decode("ascii") for _ in range(draws))
+    
+    # Every draw complies and every compliant password shows up
+    assert set(counts) == expected
+    
+    # Chi-square against the uniform distribution, far beyond any plausible fluctuation
+    dof = len(expected) - 1
+    chi2 = sum((count - per_outcome) ** 2 / per_outcome for count in counts.values())
+    assert chi2 < dof + 6 * math.sqrt(2 * dof)
+
+
+def test_policy_sampler_rejects_unsatisfiable_policy():
+    with pytest.raises(ValueError):
+        password.PolicySampler(["ab", "01"], [2, 2], 3)
+    with pytest.raises(ValueError):
+        password.PolicySampler(["a"], [0], 3, max_run=2)
+
+
+def test_generate_with_policy_honours_constraints():
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("policy"))
+    policy = password.PasswordPolicy(min_lower=2, min_upper=2, min_digits=3, min_symbols=2,
+                                     exclude="xyzXYZ", exclude_ambiguous=True, max_run=1)
+    batch = generator.generate_batch_with_policy(policy, 500, 12)
+    forbidden = set("xyzXYZ" + password.PasswordPolicy.AMBIGUOUS_CHARACTERS)
+    for candidate in batch:
+        assert len(candidate) == 12
+        assert not forbidden.intersection(candidate)
+        assert sum(c.islower() for c in candidate) >= 2
+        assert sum(c.isupper() for c in candidate) >= 2
+        assert sum(c.isdigit() for c in candidate) >= 3
+        assert sum(c in generator.symbols for c in candidate) >= 2
+        assert all(a != b for a, b in zip(candidate, candidate[1:]))
+
+
+def test_policy_exclusions_that_empty_a_required_class_fail():
+    generator = password.PasswordGenerator()
+    policy = password.PasswordPolicy(exclude="0123456789")
+    with pytest.raises(ValueError):
+        generator.generate_with_policy(policy, 16)
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import password
+
+
+@pytest.fixture
+def reuse_index(monkeypatch):
+    # A fixed key makes the MinHash signatures, and so the test, deterministic
+    def make(**kwargs):
+        with monkeypatch.context() as patch:
+            patch.setattr(os, "urandom", lambda n: bytes(range(n)))
+            return password.ReuseIndex(**kwargs)
+    return make
+
+
+def _random_passwords(n, seed="reuse"):
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource(seed))
+    return list(generator.generate_batch(n, 14))
+
+
+def test_exact_reuse_groups(reuse_index):
+    index = reuse_index()
+    vault = ["hunter2", "Tr0ub4dor&3", "hunter2", "x9$Lm2!qP", "Tr0ub4dor&3", "hunter2"]
+    assert [index.add(p) for p in vault] == [(0, True), (1, True), (0, False), (2, True), (1, False), (0, False)]
+    assert len(index) == 6
+    groups = index.groups()
+    assert [reuse for reuse, _similar in groups] == [1, 2, 1, None, 2, 1]
+    # Repeating one password is exact reuse, not a near-duplicate group
+    assert all(similar is None for _reuse, similar in groups)
+
+
+def test_near_duplicate_groups(reuse_index):
+    index = reuse_index()
+    vault = ["Summer2023!", "CorrectHorseBattery2023", "summer2024!"] + _random_passwords(200)
+    vault += ["correcthorsebattery2024", "Summer2025!", "Summer2023!"]
+    for p in vault:
+        index.add(p)
+    groups = index.groups()
+    
+    summer = {groups[i][1] for i in (0, 2, len(vault) - 2, len(vault) - 1)}
+    horse = {groups[i][1] for i in (1, len(vault) - 3)}
+    assert len(summer) == 1 and None not in summer
+    assert len(horse) == 1 and None not in horse
+    assert summer != horse
+    # Unrelated random passwords are never grouped
+    assert all(groups[i] == (None, None) for i in range(3, 203))
+    # Summer2023! also appears twice verbatim
+    assert groups[0][0] == groups[-1][0] == 1
+
+
+def test_similarity_estimates_jaccard(reuse_index):
+    index = reuse_index()
+    for p in ("Summer2023!", "Summer2024!", "Summer2023!x", "zqj#81Kd"):
+        index.add(p)
+    assert index.similarity(0, 0) == 1.0
+    assert index.similarity(0, 1) == pytest.approx(8 / 14, abs=0.2)
+    assert index.similarity(0, 2) > index.similarity(0, 1)
+    assert index.similarity(0, 3) < 0.1
+
+
+def test_signatures_match_without_numpy(reuse_index, monkeypatch):
+    pytest.importorskip("numpy")
+    vault = ["a", "Summer2023!", "пароль-2024"] + _random_passwords(20)
+    with_numpy = reuse_index()
+    for p in vault:
+        with_numpy.add(p)
+    monkeypatch.setattr(password, "load_numpy", lambda: None)
+    without_numpy = reuse_index()
+    for p in vault:
+        without_numpy.add(p)
+    assert with_numpy._signatures == without_numpy._signatures
+    assert with_numpy.groups() == without_numpy.groups()
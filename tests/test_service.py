@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import password
+
+
+def _post(service, path, payload):
+    return service.dispatch('POST', path, json.dumps(payload).encode('utf-8'))
+
+
+def test_generate_merges_requests_and_splits_large_batches():
+    service = password.PasswordService(workers=1)
+    service.MAX_BATCH_CHARS = 1000
+    calls = []
+    generate_batch = service.generator.generate_batch
+    
+    def counting_generate_batch(n, *options):
+        calls.append(n)
+        return generate_batch(n, *options)
+    
+    service.generator.generate_batch = counting_generate_batch
+    
+    async def run():
+        return await asyncio.gather(*(_post(service, '/generate', {'count': count, 'length': 20})
+                                      for count in (30, 40, 50)))
+    
+    responses = asyncio.run(run())
+    assert [status for status, _ in responses] == [200, 200, 200]
+    assert [len(payload['passwords']) for _, payload in responses] == [30, 40, 50]
+    assert all(len(p) == 20 for _, payload in responses for p in payload['passwords'])
+    # One merged batch of 120 passwords, cut into generate_batch calls of at most 1000 characters
+    assert calls == [50, 50, 20]
+    assert service._generating == 0
+
+
+def test_generate_counts_against_the_pending_budget():
+    service = password.PasswordService(workers=1, max_pending=2)
+    slot = service.GENERATE_SLOT_CHARS
+    
+    async def run():
+        return await asyncio.gather(*(_post(service, '/generate', {'count': slot // 64, 'length': 64})
+                                      for _ in range(3)))
+    
+    statuses = [status for status, _ in asyncio.run(run())]
+    assert statuses == [200, 200, 503]
+    assert service._generating == 0
+    
+    # A request that could never fit is a client error, not an overload
+    status, payload = asyncio.run(_post(service, '/generate', {'count': 10000, 'length': 4096}))
+    assert status == 400, payload
+
+
+def test_large_generate_batches_run_off_the_event_loop():
+    service = password.PasswordService(workers=1)
+    service.INLINE_BATCH_CHARS = 100
+    used_executor = []
+    
+    async def run():
+        loop = asyncio.get_running_loop()
+        run_in_executor = loop.run_in_executor
+        
+        def recording_run_in_executor(executor, func, *args):
+            used_executor.append(func.__name__)
+            return run_in_executor(executor, func, *args)
+        
+        loop.run_in_executor = recording_run_in_executor
+        small = await _post(service, '/generate', {'count': 2, 'length': 10})
+        large = await _post(service, '/generate', {'count': 50, 'length': 10})
+        invalid = await _post(service, '/generate', {'count': 50, 'length': 10, 'lower': False, 'upper': False,
+                                                    'digits': False, 'symbols': False})
+        return small, large, invalid
+    
+    small, large, invalid = asyncio.run(run())
+    assert small[0] == large[0] == 200 and len(large[1]['passwords']) == 50
+    assert invalid[0] == 400
+    assert used_executor == ['_generate_passwords', '_generate_passwords']
+
+
+def _strict_json(data):
+    def reject(constant):
+        raise ValueError(f"Not valid JSON: {constant}")
+    return json.loads(data, parse_constant=reject)
+
+
+def test_short_generate_requests_return_valid_json():
+    service = password.PasswordService(workers=1)
+    for length in (1, 2, 3):
+        status, payload = asyncio.run(_post(service, '/generate', {'count': 3, 'length': length}))
+        assert status == 200
+        body = service._response(status, payload, True).split(b"\r\n\r\n", 1)[1]
+        result = _strict_json(body)
+        assert result['search_space_log10'] > 0
+        assert all(len(p) == length for p in result['passwords'])
+
+
+def test_responses_never_contain_infinity():
+    service = password.PasswordService(workers=1)
+    payload = {'results': [{'guesses': float('inf'), 'guesses_log10': 1234.5, 'crack_times': {}}]}
+    body = service._response(200, payload, True).split(b"\r\n\r\n", 1)[1]
+    assert _strict_json(body) == {'results': [{'guesses': None, 'guesses_log10': 1234.5, 'crack_times': {}}]}
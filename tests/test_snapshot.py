@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import password
+
+
+pytest.importorskip("zxcvbn")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORDS = ["Tr0ub4dor&3", "correcthorsebatterystaple", "p@ssw0rd1990", "drowssap", "JessicaSmith1987!",
+             "qwertyuiop", "iloveyou2", "Zxcvbnm,./", "MONKEY", "s3cr3tsauce", "abc123xyz", "hunter2"]
+
+# Every match and the final scoring, from zxcvbn as loaded by load_zxcvbn() or stock
+SCRIPT = """
+import json, sys
+sys.path.insert(0, %r)
+if sys.argv[1] == 'stock':
+    import zxcvbn, zxcvbn.matching
+    snapshot = False
+else:
+    import password
+    zxcvbn = password.load_zxcvbn()
+    snapshot = isinstance(zxcvbn.matching.RANKED_DICTIONARIES['passwords'], password.RankedIndexDictionary)
+results = []
+for candidate in json.loads(sys.argv[2]):
+    matches = sorted(json.dumps({k: v for k, v in m.items() if k != 'sub'}, sort_keys=True, default=str)
+                     for m in zxcvbn.matching.omnimatch(candidate))
+    result = zxcvbn.zxcvbn(candidate)
+    results.append([matches, result['score'], str(result['guesses'])])
+print(json.dumps({'snapshot': snapshot, 'results': results}))
+""" % ROOT
+
+
+def _run(cache, mode='snapshot'):
+    env = dict(os.environ, XDG_CACHE_HOME=str(cache))
+    output = subprocess.run([sys.executable, '-c', SCRIPT, mode, json.dumps(PASSWORDS)], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def _snapshot_path(cache):
+    return os.path.join(str(cache), "secretsauce", password.ZXCVBN_SNAPSHOT_NAME)
+
+
+def test_snapshot_matches_equal_stock_matches(tmp_path):
+    stock = _run(tmp_path, 'stock')
+    first = _run(tmp_path)
+    assert not first['snapshot'] and os.path.exists(_snapshot_path(tmp_path))
+    second = _run(tmp_path)
+    assert second['snapshot']
+    assert first['results'] == stock['results']
+    assert second['results'] == stock['results']
+
+
+@pytest.mark.parametrize("damage", ["garbage", "truncated", "empty", "stale"])
+def test_damaged_or_stale_snapshot_is_rebuilt(tmp_path, damage):
+    stock = _run(tmp_path, 'stock')
+    _run(tmp_path)
+    path = _snapshot_path(tmp_path)
+    with open(path, 'rb') as f:
+        data = bytearray(f.read())
+    if damage == "garbage":
+        data = bytearray(os.urandom(len(data)))
+    elif damage == "truncated":
+        data = data[:len(data) // 2]
+    elif damage == "empty":
+        data = bytearray()
+    else:
+        # Stamped with another zxcvbn installation's frequency list size
+        data[8:16] = (int.from_bytes(data[8:16], 'little') + 1).to_bytes(8, 'little')
+    with open(path, 'wb') as f:
+        f.write(data)
+    
+    rebuilt = _run(tmp_path)
+    assert not rebuilt['snapshot'] and rebuilt['results'] == stock['results']
+    reused = _run(tmp_path)
+    assert reused['snapshot'] and reused['results'] == stock['results']
@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+
+import password
+
+
+def _write(batches, fmt='raw'):
+    stream = io.BytesIO()
+    writer = password.PasswordStreamWriter(stream, fmt)
+    for batch in batches:
+        writer.write(batch)
+    return stream.getvalue()
+
+
+def _expected(passwords, fmt):
+    if fmt == 'jsonl':
+        return "".join(json.dumps({'password': p}, ensure_ascii=False) + "\n" for p in passwords).encode('utf-8')
+    if fmt == 'csv':
+        return ("password\n" + "".join('"' + p.replace('"', '""') + '"\n' for p in passwords)).encode('utf-8')
+    return "".join(p + "\n" for p in passwords).encode('utf-8')
+
+
+@pytest.mark.parametrize("fmt", ['raw', 'jsonl', 'csv'])
+@pytest.mark.parametrize("passwords", [
+    ['abcd', 'wxyz', '1234', 'ABCD'],
+    # Same first and last length and same total as a uniform batch
+    ['abcde', 'wxyz', '123456', 'ABCDE'],
+    ['abcd', 'ablonger', 'xy', 'abcd'],
+    ['', '', ''],
+    ['pässwörd', 'pässwörd'],
+    ['quo"te', 'back\\sl'],
+])
+def test_writer_is_byte_exact(passwords, fmt):
+    batch = password.PasswordBatch.from_passwords(passwords)
+    assert _write([batch], fmt) == _expected(passwords, fmt)
+
+
+def test_uniform_length_checks_every_boundary():
+    assert password.PasswordBatch.from_passwords(['ab', 'cd', 'ef']).uniform_length() == 2
+    assert password.PasswordBatch.from_passwords(['abc', 'd', 'ef', 'ghi']).uniform_length() is None
+    assert password.PasswordBatch.from_passwords(['', '']).uniform_length() == 0
+
+
+@pytest.mark.parametrize("fmt", ['raw', 'jsonl', 'csv'])
+def test_writer_handles_slices_and_changing_layouts(fmt):
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("stream"))
+    uniform = generator.generate_batch(10, 12)
+    mixed = password.PasswordBatch.from_passwords(['abcde', 'wxyz', '123456', 'ABCDE', 'x'])
+    # Slices start part-way into a shared buffer; the writer's buffer is reused, then re-laid out
+    batches = [uniform[3:7], uniform[7:10], mixed[0:4], uniform[0:3], generator.generate_batch(3, 5), mixed[1:5]]
+    expected = b"".join(_expected(list(b), fmt).split(b"\n", 1)[1] if fmt == 'csv' else _expected(list(b), fmt)
+                        for b in batches)
+    if fmt == 'csv':
+        expected = b"password\n" + expected
+    assert _write(batches, fmt) == expected
+
+
+def test_passphrase_command_streams_mixed_length_words(tmp_path, capsysbinary):
+    wordlist = tmp_path / "w.txt"
+    wordlist.write_text("abcd\nablonger\nxyz\naba\nbcd\nabc\n")
+    index = password.Wordlist(str(wordlist))
+    words = {index[i] for i in range(len(index))}
+    index.close()
+    for seed in ("56", "130", "7"):
+        assert password.main(['passphrase', '--wordlist', str(wordlist), '--words', '1', '--count', '40',
+                              '--batch-size', '7', '--seed', seed]) == 0
+        lines = capsysbinary.readouterr().out.decode('utf-8').splitlines()
+        assert len(lines) == 40 and set(lines) <= words
@@ -0,0 +1,17 @@
+import pytest
+
+import password
+
+
+@pytest.mark.parametrize("template", ["", "x{0}", "(dd){0}"])
+def test_empty_templates_are_rejected(template):
+    with pytest.raises(ValueError):
+        password.compile_template(template)
+
+
+def test_template_positions_follow_the_pattern():
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("template"))
+    for candidate in generator.generate_batch_from_template("Cvcc-dddd", 200):
+        assert len(candidate) == 9
+        assert candidate[0].isupper() and candidate[4] == "-"
+        assert candidate[5:].isdigit()
@@ -0,0 +1,43 @@
+from collections import Counter
+
+import pytest
+
+import password
+
+
+zxcvbn = pytest.importorskip("zxcvbn")
+
+
+def _corpus():
+    generator = password.PasswordGenerator(entropy=password.SeededEntropySource("validate"))
+    corpus = [
+        "", "a", "hunter2", "password", "Password", "P@ssw0rd", "PASSWORD1", "letmein!",
+        "dragon", "Dragon2024", "monkey123", "qwertyuiop", "asdfghjkl;'", "1qaz2wsx3edc",
+        "abcdefghijkl", "zyxwvutsrqpo", "aaaaaaaaaaaa", "abcabcabcabc", "1234567890",
+        "01/02/1990", "Summer2024!", "correcthorsebatterystaple", "Tr0ub4dor&3",
+        "iloveyou4ever", "jessica1987", "michaelJordan23", "x7#Kp", "x7#Kp9vQ2$",
+        "N0t-a-r3al-w0rd", "correct horse battery staple", "purple-monkey-dishwasher-42",
+    ]
+    for length in (6, 8, 10, 12, 16, 20, 32, 48, 64):
+        corpus.extend(generator.generate_batch(4, length))
+    corpus.extend(generator.generate_batch(4, 12, True, False, True, False))
+    corpus.extend(generator.generate_batch(4, 24, True, False, False, False))
+    return corpus
+
+
+@pytest.mark.parametrize("min_score", [0, 1, 2, 3, 4])
+def test_validate_agrees_with_full_zxcvbn(min_score):
+    analyzer = password.PasswordAnalyzer()
+    for candidate in _corpus():
+        expected = min_score <= 0 or bool(candidate) and zxcvbn.zxcvbn(candidate)['score'] >= min_score
+        result = analyzer.validate(candidate, min_score)
+        assert result.valid == expected, (candidate, min_score, result)
+
+
+def test_validate_uses_cheap_stages():
+    # The agreement above must not come from every password falling through to zxcvbn
+    analyzer = password.PasswordAnalyzer()
+    for candidate in _corpus():
+        analyzer.validate(candidate, 3)
+    stats = Counter(analyzer.validation_stats)
+    assert stats['length'] and stats['common'] and stats['fast_accept'] and stats['zxcvbn']
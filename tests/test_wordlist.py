@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+import password
+
+
+WORDS = ["abacus", "  bishop", "# comment", "", "cactus", "abacus", "11116\tdolphin"]
+
+
+@pytest.fixture
+def wordlist_path(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(WORDS) + "\n")
+    return str(path)
+
+
+def test_wordlist_skips_comments_duplicates_and_dice_rolls(wordlist_path):
+    wordlist = password.Wordlist(wordlist_path)
+    try:
+        assert [wordlist[i] for i in range(len(wordlist))] == ["abacus", "bishop", "cactus", "dolphin"]
+        assert wordlist.index_path == wordlist_path + ".idx"
+    finally:
+        wordlist.close()
+
+
+def test_wordlist_index_falls_back_to_cache_directory(wordlist_path, monkeypatch):
+    build_index = password.Wordlist.build_index.__func__
+    
+    def read_only_next_to_wordlist(cls, path, index_path=None):
+        if index_path == path + ".idx":
+            raise PermissionError(13, "Permission denied", index_path)
+        return build_index(cls, path, index_path)
+    
+    monkeypatch.setattr(password.Wordlist, "build_index", classmethod(read_only_next_to_wordlist))
+    wordlist = password.Wordlist(wordlist_path)
+    try:
+        assert wordlist.index_path == password.Wordlist.cached_index_path(wordlist_path)
+        assert wordlist.index_path.startswith(password.cache_directory())
+        assert len(wordlist) == 4
+    finally:
+        wordlist.close()
+    assert not os.path.exists(wordlist_path + ".idx")
+    
+    # The cached index is reused, and a changed wordlist gets a fresh one
+    assert password.Wordlist(wordlist_path).index_path == password.Wordlist.cached_index_path(wordlist_path)
+    with open(wordlist_path, "a") as f:
+        f.write("eagle\n")
+    wordlist = password.Wordlist(wordlist_path)
+    try:
+        assert len(wordlist) == 5
+    finally:
+        wordlist.close()